@@ -3,24 +3,163 @@
 # Handles user interface, task logic, and database interaction
 import tkinter as tk
 from tkinter import ttk, messagebox
+import argparse
 import datetime
+import re
 from datetime import datetime as dt_obj # Date validation
-from database import DatabaseManager # Import database manager and model classes
-from models import Course, Task
+from database import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH, DatabaseManager # Import database manager and model classes
+from models import Course, batch_smart_scores
+from worker import DatabaseWorker
+import forecast
+import profiling
+
+# UI handlers timed when profiling is on (see profiling.py)
+PROFILED_HANDLERS = ("refresh_tasks", "render_smart_dashboard", "blink_effect", "save_task")
+
+# Suggestions of the Repeat box, any "Every N days" can be typed in
+REPEAT_CHOICES = ("Once", "Daily", "Weekly", "Every 2 days")
+
+# Days between occurrences of a Repeat box value (None: not recurring),
+# ValueError when it is not understood
+def parse_repeat(text):
+    text = " ".join(text.lower().split())
+    if text in ("", "once"): return None
+    if text == "daily": return 1
+    if text == "weekly": return 7
+    match = re.fullmatch(r"every (\d+) days?", text)
+    if not match or int(match.group(1)) == 0: raise ValueError(text)
+    return int(match.group(1))
+
+# Virtualized task list: only a window of rows is materialized in the
+# Treeview, more pages are fetched with keyset pagination while scrolling
+class TaskListView:
+    PAGE_SIZE = 200
+    MAX_ROWS = 1000
+    SEARCH_LIMIT = 200
+
+    def __init__(self, app, tree, status):
+        self.app = app
+        self.tree = tree
+        self.status = status
+        self.order = "id"
+        self.query = ""        # Active search text, the list shows search results while set
+        self.rows = []         # Materialized rows in display order
+        self.first_key = None  # Page key of rows[0], None when the window starts at the top
+        self.at_end = False
+        self.busy = False           # A page query is running on the DB worker
+        self.reload_pending = False # A reload was requested while busy
+        self.generation = 0         # Bumped when the sort order changes
+        tree.heading("ID", command=lambda: self.set_order("id"))
+        tree.heading("Score ⭐", command=lambda: self.set_order("score"))
+        tree.heading("Deadline", command=lambda: self.set_order("due"))
+
+    def set_order(self, order):
+        # Restarts the window from the top in the new sort order
+        self.order = order; self.first_key = None; self.rows = []
+        self.generation += 1
+        self.reload(); self.tree.yview_moveto(0)
+
+    def set_query(self, query):
+        # Shows full-text search results instead of the paged list ("" clears)
+        if query == self.query: return
+        self.query = query
+        self.set_order(self.order)
+
+    def request(self, fn, callback):
+        # Runs one page query on the DB worker; a view has at most one query in
+        # flight, results for an outdated sort order are dropped
+        self.busy = True
+        generation = self.generation
+        def finish():
+            self.busy = False
+            if self.reload_pending: self.reload_pending = False; self.reload()
+        def done(rows):
+            if generation == self.generation: callback(rows)
+            finish()
+        self.app.worker.read(fn, callback=done, errback=lambda e: finish())
+
+    def reload(self):
+        # Re-reads the current window from the database
+        if self.busy: self.reload_pending = True; return
+        if self.query:
+            status, query = self.status, self.query
+            def found(rows):
+                self.rows = rows; self.at_end = True
+                self.render()
+            self.request(lambda db: db.search_tasks(query, status, limit=self.SEARCH_LIMIT), found)
+            return
+        status, order, start = self.status, self.order, self.first_key
+        limit = max(self.PAGE_SIZE, len(self.rows))
+        def loaded(rows):
+            if start is not None and not rows:
+                self.set_order(self.order); return # Window emptied, go back to the top
+            self.rows = rows
+            self.at_end = len(rows) < limit
+            self.render()
+        self.request(lambda db: db.get_task_page(status, order, start=start, limit=limit), loaded)
+
+    def on_scroll(self, first, last):
+        # Fetches the next or previous page when the view nears an edge
+        if self.busy or not self.rows: return
+        if float(last) > 0.95 and not self.at_end: self.load_next()
+        elif float(first) < 0.05 and self.first_key is not None: self.load_previous()
+
+    def load_next(self):
+        anchor = str(self.rows[-1].task_id)
+        status, order, after = self.status, self.order, DatabaseManager.page_key(self.rows[-1])
+        def loaded(page):
+            self.at_end = len(page) < self.PAGE_SIZE
+            self.rows += page
+            if len(self.rows) > self.MAX_ROWS:
+                self.rows = self.rows[-self.MAX_ROWS:]
+                self.first_key = DatabaseManager.page_key(self.rows[0])
+            self.render(); self.tree.see(anchor)
+        self.request(lambda db: db.get_task_page(status, order, after=after, limit=self.PAGE_SIZE), loaded)
+
+    def load_previous(self):
+        anchor = str(self.rows[0].task_id)
+        status, order, before = self.status, self.order, self.first_key
+        def loaded(page):
+            self.rows = page + self.rows
+            self.first_key = DatabaseManager.page_key(self.rows[0]) if len(page) == self.PAGE_SIZE else None
+            if len(self.rows) > self.MAX_ROWS:
+                self.rows = self.rows[:self.MAX_ROWS]; self.at_end = False
+            self.render(); self.tree.see(anchor)
+        self.request(lambda db: db.get_task_page(status, order, before=before, limit=self.PAGE_SIZE), loaded)
+
+    def render(self):
+        self.app.sync_tree(self.tree, self.app.build_tree_rows(self.rows, self.status != 'Done'))
 
 # Main application class controlling GUI & logic
 class AcademicManagerApp: 
+    SEARCH_DELAY_MS = 150
+    CHANGE_CHECK_TICKS = 4 # Ticks (500 ms) between checks for external database changes
+    CATEGORY_ROWS = 4 # Categories listed under CATEGORY PROGRESS
+    READER_THREADS = 2 # Parallel database readers (list pages, dashboard, search)
+    FORECAST_DAYS = 60 # Horizon of the "What if I skip today?" forecast
+    FORECAST_COLORS = ("#3b82F6", "#f6b81b", "#f53737", "#0bab13") # Chart line of each forecast scenario
+
     def __init__(self, root):
         # Constructor: initializes window, database and default settings
         self.root = root
         self.root.title("Academic Task Manager")
         self.root.geometry("1300x850")
         
-        self.db = DatabaseManager() # Create database connection object
+        self.db = DatabaseManager(tune=True) # Create database connection object (WAL, tuned cache)
+        # Every database call runs on this worker thread, results come back via root.after
+        self.worker = DatabaseWorker(self.db, root, on_error=self.show_db_error, readers=self.READER_THREADS)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         self.is_widget = False
         self.is_dark_mode = False
         self.blink_state = True 
         self.editing_id = None 
+        self.rendered_rows = {} # Rows currently shown in each Treeview, keyed by task_id
+        self.blink_ids = {}     # Per Treeview: ids of rendered rows tagged 'blink_eligible'
+        self.tick_id = None
+        self.tick_count = 0
+        self.clock_text = None
+        self.snapshot = None    # Dashboard snapshot currently on screen
+        self.forecast_win = None # Forecast window while it is open
         
         self.colors = {  # Color configuration used in UI
             "bg": "#ffffff",
@@ -39,9 +178,12 @@ class AcademicManagerApp:
 
         # Creates and arranges all GUI components 
         self.setup_ui()
-        self.update_clock()
-        self.blink_effect() 
+        self.root.bind("<Map>", lambda e: self.start_ticking())
+        self.start_ticking()
         self.refresh_tasks()
+        for note in self.db.upgrade_notes: messagebox.showwarning("Database Upgraded", note)
+        # Move old completed tasks to the archive in the background
+        self.archive_old_tasks()
 
     def setup_ui(self):
         # Configure main background
@@ -76,6 +218,15 @@ class AcademicManagerApp:
         
         self.prio_var = tk.StringVar(value="Medium")
         ttk.Combobox(self.sidebar, textvariable=self.prio_var, values=("High", "Medium", "Low"), state="readonly").pack(fill="x", padx=25, pady=(5, 15))
+
+        # Recurring tasks: repeat rule and optional last date (empty: no end)
+        repeat_row = tk.Frame(self.sidebar, bg=self.colors["sidebar"])
+        repeat_row.pack(fill="x", padx=25, pady=(0, 5))
+        self.repeat_var = tk.StringVar(value="Once")
+        ttk.Combobox(repeat_row, textvariable=self.repeat_var, values=REPEAT_CHOICES, width=12).pack(side="left")
+        tk.Label(repeat_row, text="until", fg="#ffffff", bg=self.colors["sidebar"], font=("Helvetica", 8)).pack(side="left", padx=5)
+        self.ent_until = tk.Entry(repeat_row, bg="#FFFFFF", fg="black", insertbackground="black", bd=0, width=12)
+        self.ent_until.pack(side="left", fill="x", expand=True, ipady=4)
         
         tk.Button(self.sidebar, text="SAVE TO DATABASE", bg="#0abe13", fg="white", font=("Helvetica", 10, "bold"), 
                   command=self.save_task, relief="flat", pady=10).pack(fill="x", padx=25, pady=20)
@@ -87,6 +238,16 @@ class AcademicManagerApp:
         self.sticky_text = tk.Text(self.sticky_frame, bg="#dcf3f8", fg="#4100E4", font=("Helvetica", 9), height=10, bd=0)
         self.sticky_text.pack(fill="both")
 
+        # Per-category progress; the rows are built once and refilled on refresh
+        self.create_sidebar_header("CATEGORY PROGRESS")
+        self.category_rows = []
+        for _ in range(self.CATEGORY_ROWS):
+            lbl = tk.Label(self.sidebar, text="", fg="#ffffff", bg=self.colors["sidebar"], font=("Helvetica", 8), anchor="w")
+            lbl.pack(fill="x", padx=25)
+            bar = ttk.Progressbar(self.sidebar, orient="horizontal", mode="determinate")
+            bar.pack(fill="x", padx=25, pady=(0, 4))
+            self.category_rows.append((lbl, bar))
+
         # Main dashboard content area
         self.content = tk.Frame(self.root, bg=self.colors["bg"])
         self.content.pack(side="right", fill="both", expand=True)
@@ -133,11 +294,41 @@ class AcademicManagerApp:
         self.smart_panel = tk.Frame(self.content, bg=self.colors["bg"])
         self.smart_panel.pack(fill="x", padx=35, pady=(5, 20))
 
+        # Focus and suggestion boxes are created once and only re-configured on refresh
+        self.focus_box = tk.Frame(self.smart_panel, bg="white", highlightbackground="#cccccc", highlightthickness=2, padx=10, pady=10)
+        self.focus_box.pack(side="left", expand=True, fill="both", padx=10)
+        self.focus_title_lbl = tk.Label(self.focus_box, text="⚡🎯 TODAY'S FOCUS", font=("Helvetica", 9, "bold"), fg="#888888", bg="white")
+        self.focus_title_lbl.pack(anchor="w")
+        self.focus_lbl = tk.Label(self.focus_box, text="Nothing to focus on! ✨", font=("Helvetica", 11, "bold"), bg="white", wraplength=450)
+        self.focus_lbl.pack(anchor="w", pady=5)
+
+        s_box = tk.Frame(self.smart_panel, bg="white", highlightbackground=self.colors["simulation_yellow"], highlightthickness=2, padx=10, pady=10)
+        s_box.pack(side="left", expand=True, fill="both", padx=10)
+        tk.Label(s_box, text="💡 SYSTEM SUGGESTION", font=("Helvetica", 9, "bold"), fg="#8f5d12", bg="white").pack(anchor="w")
+        self.sugg_lbl = tk.Label(s_box, text="Start adding your work! 🚀", font=("Helvetica", 10, "bold"), bg="white")
+        self.sugg_lbl.pack(anchor="w", pady=5)
+
+        # Live search box, filters both task lists while typing (debounced)
+        self.search_frame = tk.Frame(self.content, bg=self.colors["bg"])
+        self.search_frame.pack(fill="x", padx=35)
+        tk.Label(self.search_frame, text="🔍 Search", font=("Helvetica", 10, "bold"), bg=self.colors["bg"], fg="#201E1E").pack(side="left")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.schedule_search())
+        tk.Entry(self.search_frame, textvariable=self.search_var, bg="#FFFFFF", fg="black", insertbackground="black", bd=1).pack(side="left", fill="x", expand=True, padx=10, ipady=4)
+        self.search_id = None
+
         self.notebook = ttk.Notebook(self.content)
         self.notebook.pack(fill="both", expand=True, padx=35, pady=10)
 
         self.pending_tree = self.create_task_tree(self.notebook)
         self.done_tree = self.create_task_tree(self.notebook)
+        self.rendered_rows[self.pending_tree] = {}
+        self.rendered_rows[self.done_tree] = {}
+        self.blink_ids[self.pending_tree] = set()
+        self.blink_ids[self.done_tree] = set()
+        self.pending_view = TaskListView(self, self.pending_tree, 'Pending')
+        self.done_view = TaskListView(self, self.done_tree, 'Done')
+        self.scroll_handlers = {self.pending_tree: self.pending_view.on_scroll, self.done_tree: self.done_view.on_scroll}
         self.notebook.add(self.pending_tree.master, text=" ⏳ Pending Tasks ")
         self.notebook.add(self.done_tree.master, text=" ✅ Completed Tasks ")
 
@@ -146,8 +337,23 @@ class AcademicManagerApp:
         tk.Button(self.footer, text="MARK FINISHED", bg="#0bab13", fg="white", command=self.mark_done).pack(side="left", padx=5)
         tk.Button(self.footer, text="EDIT TASK", bg="#4f8beb", fg="white", command=self.load_task_for_edit).pack(side="left", padx=5)
         tk.Button(self.footer, text="DELETE TASK", bg="#f53737", fg="white", command=self.delete_task).pack(side="left", padx=5)
+        tk.Button(self.footer, text="END REPEAT", bg="#7c3aed", fg="white", command=self.end_series).pack(side="left", padx=5)
 
         self.widget_view = tk.Frame(self.root, bg=self.colors["sidebar"])
+        self.setup_widget_view()
+
+    def setup_widget_view(self):
+        # Builds the compact widget once; render_widget_content only updates it
+        tk.Label(self.widget_view, text="STICKY NOTE", fg=self.colors["accent"], bg=self.colors["sidebar"], font=("Helvetica", 14, "bold")).pack(pady=10)
+        self.widget_note = tk.Text(self.widget_view, bg="#f9f9f9", fg="black", height=4, font=("Helvetica", 10))
+        self.widget_note.pack(padx=15, pady=5, fill="x")
+        self.widget_ent = tk.Entry(self.widget_view, bg="white", fg="black", font=("Helvetica", 10))
+        self.widget_ent.pack(padx=15, pady=5, fill="x")
+        tk.Button(self.widget_view, text="+ Add Urgent", bg="#0fca18", fg="white", font=("Helvetica", 8, "bold"), command=self.quick_add_task).pack(pady=5)
+        self.widget_task_frame = tk.Frame(self.widget_view, bg=self.colors["sidebar"])
+        self.widget_task_frame.pack(fill="x")
+        self.widget_task_lbls = [tk.Label(self.widget_task_frame, fg="white", bg="#1e293b", font=("Helvetica", 9), anchor="w") for _ in range(3)]
+        tk.Button(self.widget_view, text="CLOSE", bg=self.colors["accent"], fg="white", command=self.toggle_widget).pack(pady=15)
 
     def load_task_for_edit(self):
         # Loads selected task details for editing
@@ -174,127 +380,185 @@ class AcademicManagerApp:
             return
 
         try:
-            dt_obj.strptime(d, "%Y-%m-%d")
+            d = dt_obj.strptime(d, "%Y-%m-%d").date().isoformat() # Stored zero-padded, e.g. 2026-1-5 -> 2026-01-05
+            until = self.ent_until.get().strip()
+            until = dt_obj.strptime(until, "%Y-%m-%d").date().isoformat() if until else None
         except ValueError:
             messagebox.showerror("Invalid Date", "Use format: YYYY-MM-DD")
             return
+        try:
+            every = parse_repeat(self.repeat_var.get())
+        except ValueError:
+            messagebox.showerror("Invalid Repeat", "Use Once, Daily, Weekly or Every N days")
+            return
 
+        # Editing an occurrence of a recurring task only changes that occurrence
         if self.editing_id:
-            self.db.update_task_details(self.editing_id, t, d, p)
+            self.worker.write(DatabaseManager.update_task_details, self.editing_id, t, d, p, callback=self.after_write)
             self.editing_id = None
         else:
-            res = self.db.cursor.execute("SELECT course_id FROM courses WHERE code=?", (c,)).fetchone()
-            if res:
-                self.db.add_task(t, d, p, c, res[0])
+            def add(db):
+                course_id = db.get_course_id(c)
+                if course_id is None: return
+                if every: db.add_series(t, d, every, until, p, c, course_id)
+                else: db.add_task(t, d, p, c, course_id)
+            self.worker.write(add, callback=self.after_write)
+            self.repeat_var.set("Once"); self.ent_until.delete(0, tk.END)
 
         self.ent_title.delete(0, tk.END)
-        self.refresh_tasks()
 
     def refresh_tasks(self):
          # Refreshes task list, dashboard, and efficiency score
+         # Does nothing when the cached dashboard snapshot is still current
         if self.is_widget: return
-        for i in self.pending_tree.get_children(): self.pending_tree.delete(i)
-        for i in self.done_tree.get_children(): self.done_tree.delete(i)
-        
-        tasks = self.db.get_tasks()
-        self.course_drop['values'] = [c[0] for c in self.db.cursor.execute("SELECT code FROM courses").fetchall()]
-        
-        # Prepares task lists for sticky note display
-        high_prio_list = []
-        other_prio_list = []
-
-        total = len(tasks)
-        if total == 0:
-            self.update_sticky_note([], []) # Clear sticky note
-            self.header_progress['value'] = 0
-            self.header_prog_lbl.config(text="Efficiency Score: 0%")
-            self.badge_lbl.config(text="🏅 Badge: None", fg="#888888") 
-            self.countdown_lbl.config(text="⏳ Nearest Deadline: None")
-            self.render_smart_dashboard([], 0) 
-            return
-        # Tracks completed tasks and nearest upcoming deadline
-        done_count = 0; nearest_task = None; min_days = float('inf')
-        for r in tasks:
-            t_obj = Task(r[0], r[1], r[2], r[3], r[4], r[5], r[6])
-            score = t_obj.calculate_smart_score(); days_left = t_obj.get_days_left()
-            
-            if r[5] != 'Done':
-                # Categorizes pending tasks based on priority
-                if r[3] == "High":
-                    high_prio_list.append(r[1])
-                else:
-                    other_prio_list.append(r[1])
-
-                if days_left < min_days: min_days = days_left; nearest_task = r[1]
-                
-                tag_list = []
+        def loaded(snapshot):
+            if snapshot is self.snapshot: return # No data changed, keep what is on screen
+            self.snapshot = snapshot
+            self.course_drop['values'] = [c[0] for c in snapshot.categories]
+            # Each view only re-reads the window of rows it currently shows
+            self.pending_view.reload()
+            self.done_view.reload()
+            self.render_summary(snapshot)
+        self.worker.read(DatabaseManager.get_dashboard, key="dashboard", callback=loaded)
+
+    def schedule_search(self):
+        # Debounce: search only once typing pauses
+        if self.search_id is not None: self.root.after_cancel(self.search_id)
+        self.search_id = self.root.after(self.SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self.search_id = None
+        query = self.search_var.get().strip()
+        self.pending_view.set_query(query)
+        self.done_view.set_query(query)
+
+    def archive_old_tasks(self, moved=0):
+        # One batch per queued write, so reads and edits get in between;
+        # the view is refreshed once the last batch is done
+        def done(batch):
+            if batch == ARCHIVE_BATCH: self.archive_old_tasks(moved + batch)
+            elif moved + batch: self.after_write()
+        self.worker.write(DatabaseManager.archive_done, ARCHIVE_AFTER_DAYS, None, ARCHIVE_BATCH, callback=done)
+
+    def after_write(self, result=None):
+        # Callback for finished writes: re-reads whatever the current view shows
+        if self.is_widget: self.render_widget_content()
+        else: self.refresh_tasks()
+
+    def show_db_error(self, error):
+        messagebox.showerror("Database Error", str(error))
+
+    def close(self):
+        # Lets queued writes finish before the window goes away
+        self.worker.stop()
+        self.root.destroy()
+
+    def build_tree_rows(self, tasks, pending):
+        # Converts Task records into (iid, values, tags) entries for sync_tree
+        tree_rows = []
+        # Scores every task in one pass instead of building a Task per row
+        days_col, score_col = batch_smart_scores([t.due_day for t in tasks], [t.priority for t in tasks])
+        for t, score, days_left in zip(tasks, score_col, days_col):
+            tag_list = []
+            if pending:
                 if days_left < 0: tag_list.append('overdue')
-                elif r[3] == "High":
+                elif t.priority == "High":
                     tag_list.append('high_prio')
                     if days_left <= 1: tag_list.append('blink_eligible')
-                elif r[3] == "Medium": tag_list.append('med_prio')
+                elif t.priority == "Medium": tag_list.append('med_prio')
                 else: tag_list.append('low_prio')
-                self.pending_tree.insert("", "end", values=(r[0], f"⭐ {score}", r[1], r[7], r[2], r[3]), tags=tuple(tag_list))
-            else:
-                done_count += 1
-                self.done_tree.insert("", "end", values=(r[0], f"⭐ {score}", r[1], r[7], r[2], r[3]))
-        
-        # Updates efficiency score, badges, and nearest deadline display
-        self.update_sticky_note(high_prio_list, other_prio_list)
+            tree_rows.append((str(t.task_id), (t.task_id, f"⭐ {score}", t.title, t.code, t.due_date, t.priority), tuple(tag_list)))
+        return tree_rows
 
-        eff = int((done_count / total * 100)) if total > 0 else 0
+    def render_summary(self, snapshot):
+        # Updates sticky note, efficiency score, badge and nearest deadline from the dashboard snapshot
+        self.update_sticky_note(snapshot.urgent, snapshot.upcoming)
+        eff = snapshot.efficiency
         self.header_progress['value'] = eff; self.header_prog_lbl.config(text=f"Efficiency Score: {eff}%")
         
-        if eff >= 80: self.badge_lbl.config(text="🏆 Badge: Top Performer", fg="#0fca18")
+        if snapshot.total == 0: self.badge_lbl.config(text="🏅 Badge: None", fg="#888888") 
+        elif eff >= 80: self.badge_lbl.config(text="🏆 Badge: Top Performer", fg="#0fca18")
         elif eff >= 50: self.badge_lbl.config(text="👍 Badge: Consistent", fg="#f6b81b")
         else: self.badge_lbl.config(text="⚠ Badge: Needs Focus", fg="#555555")
         
-        if nearest_task:
-            day_text = "Today!" if min_days == 0 else f"({min_days} days left)"
-            self.countdown_lbl.config(text=f"⏳ Nearest Deadline: {nearest_task} {day_text}")
+        if snapshot.nearest:
+            day_text = "Today!" if snapshot.nearest_days == 0 else f"({snapshot.nearest_days} days left)"
+            self.countdown_lbl.config(text=f"⏳ Nearest Deadline: {snapshot.nearest[0]} {day_text}")
         else: self.countdown_lbl.config(text="⏳ Nearest Deadline: None")
-        self.render_smart_dashboard(tasks, eff)
-
-    def update_sticky_note(self, high_tasks, other_tasks):
-        # Displays top urgent and planned tasks in the sticky note
+        self.render_smart_dashboard(snapshot)
+        self.render_category_progress(snapshot.categories)
+
+    def render_category_progress(self, categories):
+        # Shows the categories with the most pending work, from (code, name, pending, done, next_due) rows
+        today = str(datetime.date.today())
+        busiest = sorted(categories, key=lambda c: -c[2])[:self.CATEGORY_ROWS]
+        for i, (lbl, bar) in enumerate(self.category_rows):
+            if i >= len(busiest):
+                lbl.config(text=""); bar['value'] = 0
+                continue
+            code, _, pending, done, next_due = busiest[i]
+            total = pending + done
+            text = f"{code}: {done}/{total} done"
+            if next_due: text += f" · next {next_due}"
+            lbl.config(text=text, fg="#ff6b6b" if next_due and next_due < today else "#ffffff")
+            bar['value'] = done * 100 / total if total else 0
+
+    def sync_tree(self, tree, rows):
+        # Applies only the differences between the rendered rows and the new rows
+        # rows: ordered list of (iid, values, tags), iid is the task_id as text
+        rendered = self.rendered_rows[tree]
+        blinking = self.blink_ids[tree]
+        wanted = {iid: (values, tags) for iid, values, tags in rows}
+
+        removed = [iid for iid in rendered if iid not in wanted]
+        if removed:
+            tree.delete(*removed)
+            for iid in removed: del rendered[iid]; blinking.discard(iid)
+
+        for iid, values, tags in rows:
+            old = rendered.get(iid)
+            if old != (values, tags):
+                # Rendered rows keep the base tags, the blink tag is only added on screen
+                shown = tags + ('blink',) if self.blink_state and 'blink_eligible' in tags else tags
+                if old is None: tree.insert("", "end", iid=iid, values=values, tags=shown)
+                else: tree.item(iid, values=values, tags=shown)
+                if 'blink_eligible' in tags: blinking.add(iid)
+                else: blinking.discard(iid)
+            rendered[iid] = (values, tags)
+
+        # Reorder in a single call only when the row order actually changed
+        order = [iid for iid, _, _ in rows]
+        if list(rendered) != order:
+            tree.set_children("", *order)
+            self.rendered_rows[tree] = {iid: rendered[iid] for iid in order}
+
+    def update_sticky_note(self, urgent_tasks, later_tasks):
+        # Displays the most urgent tasks by smart score and the ones right after them
         self.sticky_text.config(state="normal")
         self.sticky_text.delete("1.0", tk.END)
         
         self.sticky_text.insert(tk.END, "• ⚡ Do Urgent:\n")
-        if high_tasks:
-            for task in high_tasks[:3]: # Show top 3
+        if urgent_tasks:
+            for task in urgent_tasks[:3]: # Show top 3
                 self.sticky_text.insert(tk.END, f"  - {task}\n")
         else:
             self.sticky_text.insert(tk.END, "  (None)\n")
             
         self.sticky_text.insert(tk.END, "\n• 📅 Plan Later:\n")
-        if other_tasks:
-            for task in other_tasks[:3]: 
+        if later_tasks:
+            for task in later_tasks[:3]: 
                 self.sticky_text.insert(tk.END, f"  - {task}\n")
         else:
             self.sticky_text.insert(tk.END, "  (None)\n")
         self.sticky_text.config(state="disabled")
 
-    def render_smart_dashboard(self, tasks, efficiency):
+    def render_smart_dashboard(self, snapshot):
         # Displays focus task and system suggestions
-        for w in self.smart_panel.winfo_children(): w.destroy()
-        pending = [r for r in tasks if r[5] != 'Done']
-        f_box_border = "#cccccc" if not pending else "red"
-        f_box = tk.Frame(self.smart_panel, bg="white", highlightbackground=f_box_border, highlightthickness=2, padx=10, pady=10)
-        f_box.pack(side="left", expand=True, fill="both", padx=10)
-        tk.Label(f_box, text="⚡🎯 TODAY'S FOCUS", font=("Helvetica", 9, "bold"), fg="red" if pending else "#888888", bg="white").pack(anchor="w")
-        focus_task = next((t for t in pending if t[3] == 'High'), pending[0] if pending else None)
-        focus_text = focus_task[1] if focus_task else "Nothing to focus on! ✨"
-        tk.Label(f_box, text=focus_text, font=("Helvetica", 11, "bold"), bg="white", wraplength=450).pack(anchor="w", pady=5)
-        
-        s_box = tk.Frame(self.smart_panel, bg="white", highlightbackground=self.colors["simulation_yellow"], highlightthickness=2, padx=10, pady=10)
-        s_box.pack(side="left", expand=True, fill="both", padx=10)
-        tk.Label(s_box, text="💡 SYSTEM SUGGESTION", font=("Helvetica", 9, "bold"), fg="#8f5d12", bg="white").pack(anchor="w")
-        if not tasks: sugg_text = "Start adding your work! 🚀"
-        elif not pending: sugg_text = "Relax, All completed! 🎉"
-        elif efficiency < 50: sugg_text = "⚠️ Low efficiency! Plan High Priority tasks."
-        else: sugg_text = "Good pace! Keep it up."
-        tk.Label(s_box, text=sugg_text, font=("Helvetica", 10, "bold"), bg="white").pack(anchor="w", pady=5)
+        pending = snapshot.pending
+        self.focus_box.config(highlightbackground="#cccccc" if not pending else "red")
+        self.focus_title_lbl.config(fg="red" if pending else "#888888")
+        self.focus_lbl.config(text=snapshot.focus or "Nothing to focus on! ✨")
+        self.sugg_lbl.config(text=snapshot.suggestion)
 
     def create_task_tree(self, parent): 
         # Creates task table with visual priority and status indicators
@@ -302,7 +566,14 @@ class AcademicManagerApp:
         cols = ("ID", "Score ⭐", "Title", "Category", "Deadline", "Priority")
         tree = ttk.Treeview(container, columns=cols, show="headings", height=10)
         for col in cols: tree.heading(col, text=col); tree.column(col, width=100, anchor="center")
-        tree.column("Title", width=300, anchor="w"); tree.pack(fill="both", expand=True)
+        tree.column("Title", width=300, anchor="w")
+        scrollbar = ttk.Scrollbar(container, orient="vertical", command=tree.yview)
+        scrollbar.pack(side="right", fill="y"); tree.pack(side="left", fill="both", expand=True)
+        def on_yscroll(first, last):
+            # Keeps the scrollbar in sync and lets the list view page in more rows
+            scrollbar.set(first, last)
+            if tree in self.scroll_handlers: self.scroll_handlers[tree](first, last)
+        tree.configure(yscrollcommand=on_yscroll)
         tree.tag_configure('high_prio', background=self.colors["urgent_red"])
         tree.tag_configure('med_prio', background=self.colors["medium_yellow"])
         tree.tag_configure('low_prio', background=self.colors["low_green"])
@@ -318,69 +589,99 @@ class AcademicManagerApp:
             self.root.attributes("-topmost", True); self.widget_view.pack(fill="both", expand=True); self.render_widget_content()
         else:
             self.widget_view.pack_forget(); self.root.attributes("-topmost", False); self.sidebar.pack(side="left", fill="y")
-            self.content.pack(side="right", fill="both", expand=True); self.root.geometry("1300x850"); self.refresh_tasks()
+            self.content.pack(side="right", fill="both", expand=True); self.root.geometry("1300x850"); self.refresh_tasks(); self.start_ticking()
     
     def render_widget_content(self): 
         # Displays compact widget interface
-        for w in self.widget_view.winfo_children(): w.destroy()
-        tk.Label(self.widget_view, text="STICKY NOTE", fg=self.colors["accent"], bg=self.colors["sidebar"], font=("Helvetica", 14, "bold")).pack(pady=10)
-        note = tk.Text(self.widget_view, bg="#f9f9f9", fg="black", height=4, font=("Helvetica", 10))
-        note.pack(padx=15, pady=5, fill="x"); note.insert("1.0", self.sticky_text.get("1.0", tk.END))
-        self.widget_ent = tk.Entry(self.widget_view, bg="white", fg="black", font=("Helvetica", 10))
-        self.widget_ent.pack(padx=15, pady=5, fill="x")
-        tk.Button(self.widget_view, text="+ Add Urgent", bg="#0fca18", fg="white", font=("Helvetica", 8, "bold"), command=self.quick_add_task).pack(pady=5)
-        for t in [t for t in self.db.get_tasks() if t[3]=="High" and t[5]!="Done"][:3]: 
-            tk.Label(self.widget_view, text=f"• {t[1]}", fg="white", bg="#1e293b", font=("Helvetica", 9), anchor="w").pack(fill="x", padx=15)
-        tk.Button(self.widget_view, text="CLOSE", bg=self.colors["accent"], fg="white", command=self.toggle_widget).pack(pady=15)
+        self.widget_note.delete("1.0", tk.END); self.widget_note.insert("1.0", self.sticky_text.get("1.0", tk.END))
+        def show(snapshot):
+            urgent = snapshot.urgent
+            for i, lbl in enumerate(self.widget_task_lbls):
+                if i < len(urgent): lbl.config(text=f"• {urgent[i]}"); lbl.pack(fill="x", padx=15)
+                else: lbl.pack_forget()
+        self.worker.read(DatabaseManager.get_dashboard, key="dashboard", callback=show)
 
     def quick_add_task(self):
         # Quickly adds a high priority task
         title = self.widget_ent.get()
         if title:
-            categories = [c[0] for c in self.db.cursor.execute("SELECT course_id FROM courses").fetchall()]
-            if categories: self.db.add_task(title, str(datetime.date.today()), "High", "Urgent", categories[0]); self.render_widget_content()
+            def add(db):
+                categories = [c[0] for c in db.get_courses()]
+                if categories: db.add_task(title, str(datetime.date.today()), "High", "Urgent", categories[0])
+            self.worker.write(add, callback=self.after_write)
+
+    def start_ticking(self):
+        # (Re)starts the UI timer, e.g. when the window is shown again
+        if self.tick_id is None: self.tick()
+
+    def tick(self):
+        # Single UI timer for the clock and the blink animation.
+        # Stops while the window is minimized or in widget mode; the <Map>
+        # binding and toggle_widget restart it.
+        self.tick_id = None
+        if self.is_widget or self.root.state() in ("iconic", "withdrawn"): return
+        self.update_clock()
+        self.blink_effect()
+        # Every few seconds check whether another process changed the database
+        self.tick_count += 1
+        if self.tick_count % self.CHANGE_CHECK_TICKS == 0: self.refresh_tasks()
+        self.tick_id = self.root.after(500, self.tick)
 
     def update_clock(self):
-        # Updates live clock and greeting message
+        # Updates live clock and greeting message, only when the text changes
         now = datetime.datetime.now()
+        text = now.strftime("%I:%M:%S %p")
+        if text == self.clock_text: return
+        self.clock_text = text
         greeting = "Good Morning! ☀️" if now.hour < 12 else ("Good Afternoon! 🌤️" if now.hour < 17 else "Good Evening! 🌙")
-        self.greet_lbl.config(text=greeting)
-        self.clock_lbl.config(text=now.strftime("%I:%M:%S %p")); self.root.after(1000, self.update_clock)
+        if self.greet_lbl.cget("text") != greeting: self.greet_lbl.config(text=greeting)
+        self.clock_lbl.config(text=text)
 
     def blink_effect(self): 
-        # Blinks urgent tasks for attention
+        # Blinks urgent tasks for attention, only rows tagged 'blink_eligible' are touched
         self.blink_state = not self.blink_state
-        for i in self.pending_tree.get_children():
-            tags = list(self.pending_tree.item(i, 'tags'))
-            if 'blink_eligible' in tags:
-                if self.blink_state:
-                    if 'blink' not in tags: tags.append('blink')
-                else:
-                    if 'blink' in tags: tags.remove('blink')
-                self.pending_tree.item(i, tags=tuple(tags))
-        self.root.after(500, self.blink_effect)
+        for tree, ids in self.blink_ids.items():
+            rendered = self.rendered_rows[tree]
+            for i in ids:
+                tags = rendered[i][1]
+                tree.item(i, tags=tags + ('blink',) if self.blink_state else tags)
+
+    def selected_ids(self, tree):
+        # Task ids of all selected rows (multi-select), or of the focused row
+        sel = tree.selection() or ((tree.focus(),) if tree.focus() else ())
+        return [tree.item(i, 'values')[0] for i in sel]
 
     def mark_done(self): 
-        # Marks selected task as completed
-        sel = self.pending_tree.focus()
-        if sel: self.db.mark_done(self.pending_tree.item(sel, 'values')[0]); self.refresh_tasks()
+        # Marks selected tasks as completed in one transaction
+        ids = self.selected_ids(self.pending_tree)
+        if ids: self.worker.write(DatabaseManager.mark_done_many, ids, callback=self.after_write)
 
     def delete_task(self): 
-        # Deletes selected task from database
-        sel = self.pending_tree.focus() or self.done_tree.focus()
-        if sel: 
-            tree = self.pending_tree if self.pending_tree.focus() else self.done_tree
-            self.db.delete_task(tree.item(sel, 'values')[0]); self.refresh_tasks()
+        # Deletes selected tasks from database (for a recurring task only that occurrence)
+        ids = self.selected_ids(self.pending_tree) or self.selected_ids(self.done_tree)
+        if ids: self.worker.write(DatabaseManager.delete_many, ids, callback=self.after_write)
+
+    def end_series(self):
+        # Stops the recurring tasks of the selected occurrences from their day on
+        ids = self.selected_ids(self.pending_tree) or self.selected_ids(self.done_tree)
+        if not ids:
+            messagebox.showwarning("Selection Required", "Please select an occurrence of a recurring task!")
+        elif messagebox.askyesno("End Repeat", "Stop repeating the selected task(s) from this occurrence on?"):
+            self.worker.write(DatabaseManager.end_series, ids, callback=self.after_end_series)
+
+    def after_end_series(self, ended):
+        if not ended: messagebox.showinfo("End Repeat", "The selected task does not repeat.")
+        self.after_write()
 
     def remove_course(self): 
         # Removes selected category and its related tasks
         sel = self.course_var.get()
-        if sel: self.db.delete_course(sel); self.course_var.set(""); self.refresh_tasks()
+        if sel: self.worker.write(DatabaseManager.delete_course, sel, callback=self.after_write); self.course_var.set("")
 
     def register_course(self):
          # Registers a new category in the database 
         c = self.ent_course_code.get().strip()
-        if c: self.db.add_course(Course(None, c, c)); self.refresh_tasks()
+        if c: self.worker.write(DatabaseManager.add_course, Course(None, c, c), callback=self.after_write)
 
     def toggle_theme(self): 
         # Toggles between light and dark theme
@@ -398,20 +699,68 @@ class AcademicManagerApp:
         tk.Label(self.sidebar, text=text, fg="#ffffff", bg=self.colors["sidebar"], font=("Helvetica", 8, "bold")).pack(anchor="w", padx=25, pady=(15, 5))
     
     def simulate_skip(self):  
-        # Checks the risk of postponing today's tasks
-        tasks = self.db.get_tasks()
-        pending = [t for t in tasks if t[5] != 'Done']
-        total_p = len(pending)
-        today_s = str(datetime.date.today())
-        high_alert = any(t[3] == "High" or t[2] <= today_s for t in pending)
-        if total_p == 0: messagebox.showinfo("Chill", "Safe to take a break! 🏖️")
-        elif high_alert: messagebox.showerror("Stop", "Backlog danger! Critical tasks need attention. 🛑")
-        elif total_p > 2: messagebox.showerror("Stop", "Backlog danger! Too many pending tasks. 🛑")
-        elif total_p == 2: messagebox.showwarning("Risk", "Small risk, manageable backlog tomorrow. ⚖️")
-        else: messagebox.showinfo("Chill", "Only one minor task left. Safe to rest! 🏖️")
-        
+        # Projects the backlog day by day for skipping today and other scenarios (see forecast.py)
+        self.worker.read(forecast.forecast_db, self.FORECAST_DAYS, key="forecast", callback=self.show_forecast)
+
+    def setup_forecast_window(self):
+        # Builds the forecast window once; show_forecast refills it
+        win = self.forecast_win = tk.Toplevel(self.root)
+        win.title("What if I skip today?")
+        win.transient(self.root)
+        win.protocol("WM_DELETE_WINDOW", self.close_forecast)
+        self.forecast_lbl = tk.Label(win, text="", font=("Helvetica", 10, "bold"), wraplength=520, justify="left")
+        self.forecast_lbl.pack(anchor="w", padx=15, pady=(15, 5))
+        cols = ("Scenario",) + tuple(f"Day {d}" for d in forecast.checkpoints(self.FORECAST_DAYS))
+        self.forecast_tree = ttk.Treeview(win, columns=cols, show="headings", height=len(forecast.SCENARIOS))
+        for col in cols: self.forecast_tree.heading(col, text=col); self.forecast_tree.column(col, width=90, anchor="center")
+        self.forecast_tree.column("Scenario", width=110, anchor="w")
+        self.forecast_tree.pack(fill="x", padx=15)
+        tk.Label(win, text="Pending / overdue tasks / their mean smart score at the end of the day · chart: pending tasks per day",
+                 font=("Helvetica", 8), fg="#555555").pack(anchor="w", padx=15)
+        self.forecast_chart = tk.Canvas(win, width=540, height=200, bg="white", highlightthickness=0)
+        self.forecast_chart.pack(padx=15, pady=(5, 15))
+
+    def close_forecast(self):
+        self.forecast_win.destroy(); self.forecast_win = None
+
+    def show_forecast(self, result):
+        # Verdict, a table at the checkpoint days and the chart of a forecast.Forecast
+        if self.forecast_win is None: self.setup_forecast_window()
+        else: self.forecast_win.lift()
+        self.forecast_lbl.config(text=forecast.verdict(result))
+        tree = self.forecast_tree
+        tree.delete(*tree.get_children())
+        for i, (name, cells) in enumerate(forecast.checkpoint_rows(result)):
+            tree.insert("", "end", iid=str(i), values=(name,) + tuple(f"{p} / {o} / {m:.1f}" for p, o, m in cells))
+        self.draw_forecast_chart(result)
+
+    def draw_forecast_chart(self, result):
+        # One line per scenario: pending tasks at the end of each day
+        chart = self.forecast_chart
+        chart.delete("all")
+        w, h, left, bottom = 540, 200, 40, 30
+        horizon = len(result.pending[0])
+        top = max(1, max(int(max(row)) for row in result.pending))
+        chart.create_line(left, h - bottom, w - 10, h - bottom); chart.create_line(left, 10, left, h - bottom)
+        chart.create_text(left - 4, 10, text=str(top), anchor="e", font=("Helvetica", 7))
+        chart.create_text(left - 4, h - bottom, text="0", anchor="e", font=("Helvetica", 7))
+        chart.create_text(w - 10, h - bottom + 3, text=f"day {horizon}", anchor="ne", font=("Helvetica", 7))
+        for s, (scenario, color) in enumerate(zip(result.scenarios, self.FORECAST_COLORS)):
+            points = []
+            for day, n in enumerate(result.pending[s]):
+                points += [left + (w - 10 - left) * (day + 1) / horizon, h - bottom - (h - bottom - 10) * int(n) / top]
+            if len(points) >= 4: chart.create_line(*points, fill=color, width=2)
+            chart.create_text(left + s * 125, h - 8, text=scenario.name, fill=color, anchor="w", font=("Helvetica", 8, "bold"))
+
  # Main execution block of the application
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Academic Task Manager")
+    parser.add_argument("--profile", nargs="?", const=profiling.DEFAULT_REPORT, metavar="REPORT",
+                        help=f"time database calls and UI handlers, report written on exit (or set {profiling.ENV_VAR})")
+    args = parser.parse_args()
+    profiler = profiling.enable(args.profile) if args.profile else profiling.from_env()
+    if profiler: profiler.instrument_class(AcademicManagerApp, PROFILED_HANDLERS)
     root = tk.Tk()
+    if profiler: profiler.watch_tk(root)
     app = AcademicManagerApp(root)
     root.mainloop()
@@ -0,0 +1,342 @@
+# Benchmark suite for the Academic Task Manager
+# Generates deterministic synthetic databases and times the database,
+# scoring and dashboard (refresh) paths without opening a window.
+#
+#   python benchmark.py --sizes 1000 100000 --out bench.json
+#   python benchmark.py --sizes 100000 --baseline bench.json
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+import forecast
+from database import DatabaseManager
+from models import Task, _numpy, batch_smart_scores
+
+# Share of each priority and of completed tasks in the generated data
+PRIORITY_WEIGHTS = (("High", 0.25), ("Medium", 0.45), ("Low", 0.30))
+DONE_RATIO = 0.6
+
+
+# Fill a new database with n_tasks tasks spread over n_categories.
+# The same seed and base date always produce the same rows. Completed
+# tasks have due dates in the past, pending ones cluster around today
+# with a tail of overdue and far-future deadlines.
+def generate_dataset(path, n_tasks, n_categories=40, seed=42, base_date=None):
+    rng = random.Random(seed)
+    base = base_date or datetime.date.today()
+    db = DatabaseManager(path, tune=True)
+    codes = [f"CAT{i:03d}" for i in range(n_categories)]
+    # A few big categories and a long tail, like real course loads
+    cat_weights = [1.0 / (i + 1) for i in range(n_categories)]
+    priorities = [p for p, _ in PRIORITY_WEIGHTS]
+    prio_weights = [w for _, w in PRIORITY_WEIGHTS]
+
+    def rows():
+        for i in range(n_tasks):
+            code = rng.choices(codes, cat_weights)[0]
+            prio = rng.choices(priorities, prio_weights)[0]
+            if rng.random() < DONE_RATIO:
+                status, offset = "Done", -rng.randint(0, 720)
+            else:
+                status, offset = "Pending", int(rng.gauss(7, 14))
+            due = (base + datetime.timedelta(days=offset)).isoformat()
+            yield (f"{code} task {i} {rng.choice(WORDS)} {rng.choice(WORDS)}", due, prio, code, course_ids[code], status)
+
+    try:
+        course_ids = db.ensure_courses(codes)
+        with db.transaction():
+            batch = []
+            for row in rows():
+                batch.append(row)
+                if len(batch) == 10000:
+                    db.add_tasks(batch); batch = []
+            if batch: db.add_tasks(batch)
+        db.conn.execute("ANALYZE")
+    finally:
+        db.close()
+    return path
+
+
+WORDS = ("essay", "lab", "report", "quiz", "reading", "exam", "project", "draft",
+         "review", "notes", "homework", "chapter", "slides", "gym", "run", "meeting")
+
+
+# Every DatabaseManager a scenario opens, so it can be closed afterwards
+_open_dbs = []
+
+
+def open_db(path, **kwargs):
+    db = DatabaseManager(path, **kwargs)
+    _open_dbs.append(db)
+    return db
+
+
+# Close the databases opened after the first 'keep' ones
+def close_dbs(keep=0):
+    while len(_open_dbs) > keep:
+        _open_dbs.pop().close()
+
+
+# Copy a database file with the SQLite backup API (mutating scenarios
+# each get a fresh copy so runs do not affect each other)
+def copy_db(src, dst):
+    with sqlite3.connect(src) as a, sqlite3.connect(dst) as b:
+        a.backup(b)
+    return dst
+
+
+# Time fn() 'repeat' times; setup() runs before each run, outside the timing.
+# Databases opened by setup() are closed after their run.
+def measure(fn, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        keep = len(_open_dbs)
+        try:
+            state = setup() if setup else None
+            start = time.perf_counter()
+            ops = fn(state) if setup else fn()
+            runs.append(time.perf_counter() - start)
+        finally:
+            close_dbs(keep)
+    return runs, ops
+
+
+# Every scenario gets the path of the generated database and returns
+# (setup or None, timed function). Timed functions return the number of
+# operations they performed, used for the ops/s figure. Databases are
+# opened with open_db, run_benchmarks closes them after the scenario.
+def scenario_get_tasks(path, tmp):
+    db = open_db(path)
+    return None, lambda: len(db.get_tasks())
+
+
+def scenario_add_task(path, tmp, n=500):
+    def setup():
+        return open_db(copy_db(path, os.path.join(tmp, "add.db")))
+    def run(db):
+        for i in range(n):
+            db.add_task(f"bench {i}", "2030-01-01", "Medium", "CAT000", 1)
+        return n
+    return setup, run
+
+
+def scenario_add_tasks_bulk(path, tmp, n=10000):
+    rows = [(f"bench {i}", "2030-01-01", "Medium", "CAT000", 1) for i in range(n)]
+    def setup():
+        return open_db(copy_db(path, os.path.join(tmp, "bulk.db")))
+    def run(db):
+        db.add_tasks(rows)
+        return n
+    return setup, run
+
+
+def scenario_mark_done(path, tmp, n=500):
+    def setup():
+        db = open_db(copy_db(path, os.path.join(tmp, "done.db")))
+        ids = [r[0] for r in db.cursor.execute("SELECT task_id FROM tasks WHERE status = 'Pending' LIMIT ?", (n,))]
+        return db, ids
+    def run(state):
+        db, ids = state
+        for tid in ids: db.mark_done(tid)
+        return len(ids)
+    return setup, run
+
+
+def scenario_mark_done_many(path, tmp, n=5000):
+    def setup():
+        db = open_db(copy_db(path, os.path.join(tmp, "done_many.db")))
+        ids = [r[0] for r in db.cursor.execute("SELECT task_id FROM tasks WHERE status = 'Pending' LIMIT ?", (n,))]
+        return db, ids
+    def run(state):
+        db, ids = state
+        db.mark_done_many(ids)
+        return len(ids)
+    return setup, run
+
+
+def scenario_smart_score(path, tmp):
+    tasks = open_db(path).get_tasks()
+    today = datetime.date.today()
+    def run():
+        for t in tasks: t.calculate_smart_score(today)
+        return len(tasks)
+    return None, run
+
+
+def scenario_batch_smart_scores(path, tmp):
+    tasks = open_db(path).get_tasks()
+    due = [t.due_day for t in tasks]
+    prio = [t.priority for t in tasks]
+    return None, lambda: len(batch_smart_scores(due, prio)[1])
+
+
+def scenario_delete_course(path, tmp):
+    def setup():
+        return open_db(copy_db(path, os.path.join(tmp, "delete.db")))
+    def run(db):
+        # CAT000 is the biggest category of the generated data
+        n = db.cursor.execute("SELECT COUNT(*) FROM tasks WHERE category = 'CAT000'").fetchone()[0]
+        db.delete_course("CAT000")
+        return n
+    return setup, run
+
+
+# Moves every completed task into the archive (added in bulk, they have
+# no completion date in the generated data and always qualify)
+def scenario_archive(path, tmp):
+    def setup():
+        return open_db(copy_db(path, os.path.join(tmp, "archive.db")))
+    def run(db):
+        return db.archive_done(0, datetime.date.today() + datetime.timedelta(days=1))
+    return setup, run
+
+
+# Pending pages and the urgent list with n_series daily recurring tasks
+# that started a year ago (only the next RECURRENCE_DAYS days are expanded)
+def scenario_recurring(path, tmp, n_series=50):
+    db = open_db(copy_db(path, os.path.join(tmp, "recurring.db")))
+    start = str(datetime.date.today() - datetime.timedelta(days=365))
+    with db.transaction():
+        for i in range(n_series): db.add_series(f"habit {i}", start, 1, None, "Medium", "CAT000", 1)
+    def run():
+        rows = sum(len(db.get_task_page("Pending", order, limit=200)) for order in ("id", "due"))
+        return rows + len(db.get_urgent_tasks(6))
+    return None, run
+
+
+# The "What if I skip today?" forecast: every scenario over 90 days
+def scenario_forecast(path, tmp, horizon=90):
+    db = open_db(path)
+    return None, lambda: len(forecast.forecast_db(db, horizon).pending[0]) * len(forecast.SCENARIOS)
+
+
+# What refresh_tasks loads and computes for one screen, minus the Tk calls
+def scenario_refresh(path, tmp):
+    db = open_db(path)
+    def run():
+        db.get_summary()
+        rows = 0
+        for status in ("Pending", "Done"):
+            page = db.get_task_page(status, "id", limit=200)
+            batch_smart_scores([t.due_day for t in page], [t.priority for t in page])
+            rows += len(page)
+        return rows
+    return None, run
+
+
+def scenario_search(path, tmp):
+    db = open_db(path)
+    queries = ("es", "lab rep", "CAT00", "quiz", "hom")
+    def run():
+        for q in queries: db.search_tasks(q, "Pending")
+        return len(queries)
+    return None, run
+
+
+SCENARIOS = {
+    "get_tasks": scenario_get_tasks,
+    "add_task": scenario_add_task,
+    "add_tasks_bulk": scenario_add_tasks_bulk,
+    "mark_done": scenario_mark_done,
+    "mark_done_many": scenario_mark_done_many,
+    "smart_score": scenario_smart_score,
+    "batch_smart_scores": scenario_batch_smart_scores,
+    "delete_course": scenario_delete_course,
+    "archive": scenario_archive,
+    "recurring": scenario_recurring,
+    "forecast": scenario_forecast,
+    "refresh": scenario_refresh,
+    "search": scenario_search,
+}
+
+
+# Run the selected scenarios for every dataset size, returns a JSON-ready dict
+def run_benchmarks(sizes, names, repeat=3, seed=42, workdir=None, log=print):
+    results = {}
+    _numpy() # Import NumPy (when installed) up front, not in the first timed run
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"bench_{size}.db")
+            start = time.perf_counter()
+            generate_dataset(path, size, seed=seed)
+            log(f"generated {size} tasks in {time.perf_counter() - start:.2f}s")
+            for name in names:
+                try:
+                    setup, fn = SCENARIOS[name](path, tmp)
+                    runs, ops = measure(fn, repeat, setup)
+                finally:
+                    close_dbs()
+                best = min(runs)
+                key = f"{name}@{size}"
+                results[key] = {
+                    "scenario": name,
+                    "size": size,
+                    "runs": runs,
+                    "best": best,
+                    "median": statistics.median(runs),
+                    "ops": ops,
+                    "ops_per_sec": ops / best if best > 0 else None,
+                }
+                log(f"  {key:<28} best {best * 1000:10.2f} ms  {results[key]['ops_per_sec'] or 0:14,.0f} ops/s")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+# Compare best times against a previous results file.
+# Returns the keys that got slower than the allowed threshold (e.g. 0.2 = 20%).
+def compare(current, baseline, threshold=0.2, log=print):
+    regressions = []
+    for key, res in current["results"].items():
+        old = baseline.get("results", {}).get(key)
+        if not old: continue
+        ratio = res["best"] / old["best"] if old["best"] > 0 else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key); flag = "  REGRESSION"
+        log(f"  {key:<28} {old['best'] * 1000:10.2f} -> {res['best'] * 1000:10.2f} ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Academic Task Manager benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare with an earlier --out file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, args.scenarios, args.repeat, args.seed)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("compared with", args.baseline)
+        if compare(current, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
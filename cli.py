@@ -0,0 +1,204 @@
+# Command-line interface for the Academic Task Manager
+# Works without a display: only the database and models modules are
+# imported up front, bulk import / export is loaded when it is used.
+# Uses the same academic_pro.db as the GUI and can run while it is open
+# (WAL journal; writers wait for each other instead of failing).
+#
+#   python cli.py add "Lab report" --category PHY --due 2026-11-02 --priority High
+#   python cli.py add "Gym" --category Gym --every 2 --until 2026-12-31
+#   python cli.py list --pending --order score
+#   python cli.py done 12 15
+#   python cli.py end-series -1000345
+#   python cli.py stats
+#   python cli.py due-soon --days 3
+#   python cli.py archive --days 30
+#   python cli.py forecast --days 60
+import argparse
+import datetime
+import sys
+
+from database import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH, DatabaseManager
+
+PRIORITIES = ("High", "Medium", "Low")
+
+
+def parse_date(text):
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError("use format YYYY-MM-DD")
+
+
+def positive_int(text):
+    if not text.isdigit() or int(text) == 0:
+        raise argparse.ArgumentTypeError("must be a whole number above 0")
+    return int(text)
+
+
+def print_tasks(tasks, today):
+    if not tasks:
+        print("(no tasks)")
+        return
+    for t in tasks:
+        days = t.get_days_left(today)
+        when = "today" if days == 0 else (f"{-days}d overdue" if days < 0 else f"in {days}d")
+        print(f"{t.task_id:>7}  ⭐{t.calculate_smart_score(today):>4}  {t.due_date}  {when:<12} "
+              f"{t.priority or '':<6}  {t.code or t.category or '':<10}  {t.title or ''}")
+
+
+def cmd_add(db, args):
+    course_ids = db.ensure_courses([args.category])
+    if args.every:
+        until = str(args.until) if args.until else None
+        db.add_series(args.title, str(args.due), args.every, until, args.priority, args.category, course_ids[args.category])
+        print(f"added recurring task {db.cursor.lastrowid}: {args.title} ({args.category}, every {args.every} days "
+              f"from {args.due}{f' until {until}' if until else ''}, {args.priority})")
+        return
+    db.add_task(args.title, str(args.due), args.priority, args.category, course_ids[args.category])
+    print(f"added task {db.cursor.lastrowid}: {args.title} ({args.category}, due {args.due}, {args.priority})")
+
+
+def cmd_list(db, args):
+    status = "Done" if args.done else "Pending"
+    print_tasks(db.get_task_page(status, args.order, limit=args.limit, today=args.today), args.today)
+
+
+# Negative ids are occurrences of recurring tasks, as shown by list
+def cmd_done(db, args):
+    ids = sorted(set(args.ids))
+    real = dict(zip(ids, db.resolve_task_ids(ids)))
+    known = [tid for tid in real.values() if tid is not None]
+    found = {r[0] for r in db.cursor.execute(
+        f"SELECT task_id FROM tasks WHERE task_id IN ({','.join('?' * len(known))})", known
+    ).fetchall()}
+    db.mark_done_many(sorted(found))
+    for tid in ids:
+        print(f"task {tid}: {'done' if real[tid] in found else 'not found'}")
+    return 0 if all(real[tid] in found for tid in ids) else 1
+
+
+# Stop recurring tasks from the given occurrences on (ids as shown by list)
+def cmd_end_series(db, args):
+    ended = db.end_series(args.ids)
+    print(f"{ended} recurring task(s) ended")
+    return 0 if ended else 1
+
+
+def cmd_stats(db, args):
+    s = db.get_dashboard(args.today)
+    print(f"tasks: {s.total}  done: {s.done}  pending: {s.pending}  efficiency: {s.efficiency}%")
+    print(f"high priority pending: {s.high_pending}  overdue: {s.overdue}  due today: {s.due_today}")
+    if s.nearest: print(f"nearest deadline: {s.nearest[0] or ''} ({s.nearest[1]})")
+    if s.urgent: print("most urgent: " + "; ".join(title or "" for title in s.urgent))
+    for code, name, pending, done, next_due in s.categories:
+        print(f"  {code:<10} {done:>6}/{pending + done:<6} done" + (f"  next due {next_due}" if next_due else ""))
+
+
+# Pending tasks that are overdue or due within the next 'days' days, earliest first
+def cmd_due_soon(db, args):
+    tasks = db.overdue(args.today, limit=args.limit)
+    tasks += db.due_within(args.days, args.today, limit=args.limit - len(tasks))
+    print_tasks(tasks, args.today)
+
+
+def cmd_archive(db, args):
+    # In batches, so the app and other commands are not locked out meanwhile
+    moved = 0
+    while True:
+        batch = db.archive_done(args.days, args.today, ARCHIVE_BATCH)
+        moved += batch
+        if batch < ARCHIVE_BATCH: break
+    print(f"archived {moved} tasks completed more than {args.days} days ago")
+
+
+def cmd_forecast(db, args):
+    import forecast # NumPy (optional) is only loaded for the forecast
+    result = forecast.forecast_db(db, args.days, args.today)
+    print(f"completion rate: {result.rate:.2f} tasks/day over the last {forecast.HISTORY_DAYS} days")
+    for line in forecast.table(result):
+        print(line)
+    print(forecast.verdict(result))
+
+
+def cmd_transfer(db, args):
+    import transfer # Only loaded for bulk import / export
+    if args.command == "import":
+        result = transfer.import_tasks(db, args.path, args.format, start_line=args.start_line)
+    else:
+        result = transfer.export_tasks(db, args.path, args.format)
+    print(result)
+    for line_no, message in result.errors[:20]:
+        print(f"  line {line_no}: {message}")
+    return 1 if result.errors else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Academic Task Manager (command line)")
+    parser.add_argument("--db", default="academic_pro.db")
+    parser.add_argument("--today", type=parse_date, default=datetime.date.today(), help=argparse.SUPPRESS)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("add", help="add a task")
+    p.add_argument("title")
+    p.add_argument("-c", "--category", required=True, help="category code, created if it does not exist")
+    p.add_argument("-d", "--due", type=parse_date, default=datetime.date.today())
+    p.add_argument("-p", "--priority", choices=PRIORITIES, default="Medium")
+    p.add_argument("-e", "--every", type=positive_int, metavar="DAYS",
+                   help="recurring task repeating every DAYS days from --due (1 daily, 7 weekly)")
+    p.add_argument("--until", type=parse_date, help="last day a recurring task can fall on")
+    p.set_defaults(run=cmd_add)
+
+    p = sub.add_parser("list", help="list tasks")
+    which = p.add_mutually_exclusive_group()
+    which.add_argument("--pending", action="store_true", help="pending tasks (default)")
+    which.add_argument("--done", action="store_true", help="completed tasks")
+    p.add_argument("--order", choices=("id", "due", "score"), default="due")
+    p.add_argument("-n", "--limit", type=int, default=50)
+    p.set_defaults(run=cmd_list)
+
+    p = sub.add_parser("done", help="mark tasks as done")
+    p.add_argument("ids", type=int, nargs="+")
+    p.set_defaults(run=cmd_done)
+
+    p = sub.add_parser("end-series", help="stop recurring tasks from the given occurrences on")
+    p.add_argument("ids", type=int, nargs="+")
+    p.set_defaults(run=cmd_end_series)
+
+    p = sub.add_parser("stats", help="dashboard summary")
+    p.set_defaults(run=cmd_stats)
+
+    p = sub.add_parser("due-soon", help="overdue tasks and tasks due in the next days")
+    p.add_argument("--days", type=int, default=3)
+    p.add_argument("-n", "--limit", type=int, default=50)
+    p.set_defaults(run=cmd_due_soon)
+
+    p = sub.add_parser("archive", help="move old completed tasks to the archive")
+    p.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="archive tasks completed more than this many days ago")
+    p.set_defaults(run=cmd_archive)
+
+    p = sub.add_parser("forecast", help="project the backlog day by day (skip a day, 2 tasks a day, ...)")
+    p.add_argument("--days", type=positive_int, default=60, help="horizon in days")
+    p.set_defaults(run=cmd_forecast)
+
+    for name in ("import", "export"):
+        p = sub.add_parser(name, help=f"bulk {name} of tasks (CSV or JSON Lines)")
+        p.add_argument("path")
+        p.add_argument("--format", choices=("csv", "jsonl"))
+        if name == "import":
+            p.add_argument("--start-line", type=int, default=0, help="resume an import after this line")
+        p.set_defaults(run=cmd_transfer)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    db = DatabaseManager(args.db, tune=True)
+    for note in db.upgrade_notes: print(f"note: {note}", file=sys.stderr)
+    try:
+        return args.run(db, args) or 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
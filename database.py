@@ -1,13 +1,483 @@
+import collections
+import datetime
+import heapq
+import itertools
+import operator
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+from models import Series, Task, build_dashboard, day_date, epoch_day, split_occurrence_id
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version.
+# Each entry upgrades the schema by one version; never edit an entry once
+# released, append a new one instead.
+MIGRATIONS = [
+    # 1: indexes for the hot query paths (pending/done filter, nearest
+    #    deadline, category delete, course join). courses.code is already
+    #    covered by its UNIQUE constraint.
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks(status, due_date);
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks(status, priority, due_date);
+    CREATE INDEX IF NOT EXISTS idx_tasks_course ON tasks(course_id);
+    CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category);
+    """,
+    # 2: status-only index so keyset pages ordered by task_id stay indexed
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+    """,
+    # 3: full-text index over task title and category, kept in sync by triggers
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        title, category,
+        content='tasks', content_rowid='task_id',
+        prefix='2 3'
+    );
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, category) VALUES (new.task_id, new.title, new.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, category) VALUES ('delete', old.task_id, old.title, old.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, category ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, category) VALUES ('delete', old.task_id, old.title, old.category);
+        INSERT INTO tasks_fts(rowid, title, category) VALUES (new.task_id, new.title, new.category);
+    END;
+    INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild');
+    """,
+    # 4: real creation date (left empty for tasks created before this version)
+    """
+    ALTER TABLE tasks ADD COLUMN created_at TEXT;
+    """,
+    # 5: per-course statistics kept up to date by triggers. Rows stay after
+    #    a course is deleted while tasks still point at it, so the sums
+    #    over course_stats always match the tasks table.
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_course_status_due ON tasks(course_id, status, due_date);
+    CREATE TABLE IF NOT EXISTS course_stats (
+        course_id INTEGER PRIMARY KEY,
+        pending_count INTEGER NOT NULL DEFAULT 0,
+        done_count INTEGER NOT NULL DEFAULT 0,
+        next_due TEXT -- earliest due date of a pending task
+    );
+    INSERT OR REPLACE INTO course_stats (course_id, pending_count, done_count, next_due)
+        SELECT course_id, SUM(status = 'Pending'), SUM(status = 'Done'),
+               MIN(CASE WHEN status = 'Pending' THEN due_date END)
+        FROM tasks WHERE course_id IS NOT NULL GROUP BY course_id;
+    INSERT OR IGNORE INTO course_stats (course_id) SELECT course_id FROM courses;
+
+    CREATE TRIGGER IF NOT EXISTS course_stats_course_insert AFTER INSERT ON courses BEGIN
+        INSERT OR IGNORE INTO course_stats (course_id) VALUES (new.course_id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS course_stats_task_insert AFTER INSERT ON tasks
+    WHEN new.course_id IS NOT NULL BEGIN
+        INSERT OR IGNORE INTO course_stats (course_id) VALUES (new.course_id);
+        UPDATE course_stats SET
+            pending_count = pending_count + (new.status = 'Pending'),
+            done_count = done_count + (new.status = 'Done'),
+            next_due = CASE WHEN new.status = 'Pending' AND (next_due IS NULL OR new.due_date < next_due)
+                            THEN new.due_date ELSE next_due END
+        WHERE course_id = new.course_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS course_stats_task_delete AFTER DELETE ON tasks
+    WHEN old.course_id IS NOT NULL BEGIN
+        UPDATE course_stats SET
+            pending_count = pending_count - (old.status = 'Pending'),
+            done_count = done_count - (old.status = 'Done'),
+            next_due = CASE WHEN old.status = 'Pending' AND old.due_date = next_due
+                            THEN (SELECT MIN(due_date) FROM tasks WHERE course_id = old.course_id AND status = 'Pending')
+                            ELSE next_due END
+        WHERE course_id = old.course_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS course_stats_task_update AFTER UPDATE OF status, due_date, course_id ON tasks BEGIN
+        UPDATE course_stats SET
+            pending_count = pending_count - (old.status = 'Pending'),
+            done_count = done_count - (old.status = 'Done'),
+            next_due = CASE WHEN old.status = 'Pending' AND old.due_date = next_due
+                            THEN (SELECT MIN(due_date) FROM tasks WHERE course_id = old.course_id AND status = 'Pending')
+                            ELSE next_due END
+        WHERE course_id = old.course_id;
+        INSERT OR IGNORE INTO course_stats (course_id) SELECT new.course_id WHERE new.course_id IS NOT NULL;
+        UPDATE course_stats SET
+            pending_count = pending_count + (new.status = 'Pending'),
+            done_count = done_count + (new.status = 'Done'),
+            next_due = CASE WHEN new.status = 'Pending' AND (next_due IS NULL OR new.due_date < next_due)
+                            THEN new.due_date ELSE next_due END
+        WHERE course_id = new.course_id;
+    END;
+    """,
+    # 6: completion date, and an archive table that old completed tasks move
+    #    into (same columns as tasks, its own full-text index, still counted
+    #    in course_stats). Tasks completed before this version have no
+    #    completion date: it is unknown, so they do not count toward the
+    #    completion rate (forecast.py) and archive_done moves them first.
+    """
+    ALTER TABLE tasks ADD COLUMN completed_at TEXT;
+    CREATE TABLE IF NOT EXISTS tasks_archive (
+        task_id INTEGER PRIMARY KEY,
+        title TEXT,
+        due_date TEXT,
+        priority TEXT,
+        category TEXT,
+        status TEXT DEFAULT 'Done',
+        course_id INTEGER,
+        created_at TEXT,
+        completed_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_archive_due ON tasks_archive(due_date);
+    CREATE INDEX IF NOT EXISTS idx_archive_category ON tasks_archive(category);
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_archive_fts USING fts5(
+        title, category,
+        content='tasks_archive', content_rowid='task_id',
+        prefix='2 3'
+    );
+    CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_insert AFTER INSERT ON tasks_archive BEGIN
+        INSERT INTO tasks_archive_fts(rowid, title, category) VALUES (new.task_id, new.title, new.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS tasks_archive_fts_delete AFTER DELETE ON tasks_archive BEGIN
+        INSERT INTO tasks_archive_fts(tasks_archive_fts, rowid, title, category) VALUES ('delete', old.task_id, old.title, old.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS course_stats_archive_insert AFTER INSERT ON tasks_archive
+    WHEN new.course_id IS NOT NULL BEGIN
+        INSERT OR IGNORE INTO course_stats (course_id) VALUES (new.course_id);
+        UPDATE course_stats SET done_count = done_count + 1 WHERE course_id = new.course_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS course_stats_archive_delete AFTER DELETE ON tasks_archive
+    WHEN old.course_id IS NOT NULL BEGIN
+        UPDATE course_stats SET done_count = done_count - 1 WHERE course_id = old.course_id;
+    END;
+    """,
+    # 7: due dates as day numbers (days since 1970-01-01), computed by
+    #    SQLite from due_date and indexed; the CHECK rejects anything that
+    #    is not a real YYYY-MM-DD date. Dates stored without zero padding
+    #    (2026-1-5) are rewritten as 2026-01-05 by normalize_date (see
+    #    _normalize_date); only dates that cannot be read at all, which were
+    #    scored as due today until now, are set to the day of the upgrade.
+    """
+    UPDATE tasks SET due_date = COALESCE(normalize_date(due_date), date('now', 'localtime'))
+    WHERE due_date IS NULL OR date(due_date, '+0 days') IS NOT due_date;
+    UPDATE tasks_archive SET due_date = COALESCE(normalize_date(due_date), date('now', 'localtime'))
+    WHERE due_date IS NULL OR date(due_date, '+0 days') IS NOT due_date;
+    ALTER TABLE tasks ADD COLUMN due_day INTEGER GENERATED ALWAYS AS (
+        CASE WHEN date(due_date, '+0 days') = due_date THEN CAST(julianday(due_date) - 2440587.5 AS INTEGER) END
+    ) VIRTUAL CHECK (due_day IS NOT NULL);
+    ALTER TABLE tasks_archive ADD COLUMN due_day INTEGER GENERATED ALWAYS AS (
+        CASE WHEN date(due_date, '+0 days') = due_date THEN CAST(julianday(due_date) - 2440587.5 AS INTEGER) END
+    ) VIRTUAL CHECK (due_day IS NOT NULL);
+    DROP INDEX IF EXISTS idx_tasks_status_due;
+    DROP INDEX IF EXISTS idx_tasks_status_priority;
+    DROP INDEX IF EXISTS idx_archive_due;
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_day ON tasks(status, due_day);
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_priority_day ON tasks(status, priority, due_day);
+    CREATE INDEX IF NOT EXISTS idx_archive_day ON tasks_archive(due_day);
+    """,
+    # 8: recurring tasks. A series stores its rule once; an occurrence gets
+    #    a tasks row (series_id, series_day = the day it was generated for)
+    #    only when it is completed or edited, the unique index keeps it to
+    #    one row per occurrence.
+    """
+    CREATE TABLE IF NOT EXISTS task_series (
+        series_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        priority TEXT,
+        category TEXT,
+        course_id INTEGER,
+        start_date TEXT NOT NULL CHECK (date(start_date, '+0 days') = start_date),
+        every_days INTEGER NOT NULL CHECK (every_days > 0),
+        until_date TEXT CHECK (until_date IS NULL OR date(until_date, '+0 days') = until_date),
+        created_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_series_category ON task_series(category);
+    ALTER TABLE tasks ADD COLUMN series_id INTEGER;
+    ALTER TABLE tasks ADD COLUMN series_day INTEGER;
+    ALTER TABLE tasks_archive ADD COLUMN series_id INTEGER;
+    ALTER TABLE tasks_archive ADD COLUMN series_day INTEGER;
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_series ON tasks(series_id, series_day) WHERE series_id IS NOT NULL;
+    CREATE INDEX IF NOT EXISTS idx_archive_series ON tasks_archive(series_id, series_day) WHERE series_id IS NOT NULL;
+    """,
+    # 9: occurrences the user deleted. iter_occurrences treats their days
+    #    as taken, so deleting one occurrence skips only that day.
+    """
+    CREATE TABLE IF NOT EXISTS series_skips (
+        series_id INTEGER NOT NULL,
+        series_day INTEGER NOT NULL,
+        PRIMARY KEY (series_id, series_day)
+    ) WITHOUT ROWID;
+    """,
+    # 10: pending tasks whose priority is not one of the three levels
+    #     (imported or edited outside the app, scored as Low), by due day;
+    #     normally empty, it keeps URGENT_SQL exact and fast
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_other_priority_day ON tasks(due_day)
+    WHERE status = 'Pending' AND (priority IS NULL OR priority NOT IN ('High', 'Medium', 'Low'));
+    """,
+    # 11: archived tasks by course, so get_summary counts the ones without
+    #     a course without reading the whole archive
+    """
+    CREATE INDEX IF NOT EXISTS idx_archive_course ON tasks_archive(course_id);
+    """,
+    # 12: completion dates, for count_completed (the forecast's completion
+    #     rate) and archive_done
+    """
+    CREATE INDEX IF NOT EXISTS idx_tasks_status_completed ON tasks(status, completed_at);
+    CREATE INDEX IF NOT EXISTS idx_archive_completed ON tasks_archive(completed_at);
+    """,
+    # 13: full-text indexes rebuilt with prefix indexes for 1 to 6
+    #     characters (FTS5 merged every matching term for longer ones), and
+    #     the status as a column of tasks_fts so searches filter by it
+    #     inside FTS5
+    """
+    DROP TRIGGER IF EXISTS tasks_fts_insert;
+    DROP TRIGGER IF EXISTS tasks_fts_delete;
+    DROP TRIGGER IF EXISTS tasks_fts_update;
+    DROP TABLE IF EXISTS tasks_fts;
+    DROP TABLE IF EXISTS tasks_archive_fts;
+    CREATE VIRTUAL TABLE tasks_fts USING fts5(
+        title, category, status,
+        content='tasks', content_rowid='task_id',
+        prefix='1 2 3 4 5 6'
+    );
+    CREATE VIRTUAL TABLE tasks_archive_fts USING fts5(
+        title, category,
+        content='tasks_archive', content_rowid='task_id',
+        prefix='1 2 3 4 5 6'
+    );
+    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, title, category, status) VALUES (new.task_id, new.title, new.category, new.status);
+    END;
+    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, category, status) VALUES ('delete', old.task_id, old.title, old.category, old.status);
+    END;
+    CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, category, status ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, category, status) VALUES ('delete', old.task_id, old.title, old.category, old.status);
+        INSERT INTO tasks_fts(rowid, title, category, status) VALUES (new.task_id, new.title, new.category, new.status);
+    END;
+    INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild');
+    INSERT INTO tasks_archive_fts(tasks_archive_fts) VALUES ('rebuild');
+    """,
+]
+
+# Rows a migration is about to change in a way the user should hear about:
+# version -> (query counting them before the migration runs, message).
+# DatabaseManager.migrate adds the message to upgrade_notes when the count
+# is not zero.
+MIGRATION_NOTES = {
+    7: ("SELECT (SELECT COUNT(*) FROM tasks WHERE normalize_date(due_date) IS NULL)"
+        " + (SELECT COUNT(*) FROM tasks_archive WHERE normalize_date(due_date) IS NULL)",
+        "{} task(s) had a due date that could not be read; it was set to the day of the upgrade."),
+}
+
+
+# SQL function normalize_date(text) used by the migrations: the same date
+# rule as the GUI and the importer (strptime '%Y-%m-%d', so 2026-1-5 is
+# accepted), returned as YYYY-MM-DD, or NULL when the text is not a date
+def _normalize_date(value):
+    try:
+        return datetime.datetime.strptime(str(value), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        return None
+
+
+# Completed tasks older than this many days are moved to tasks_archive
+# by DatabaseManager.archive_done
+ARCHIVE_AFTER_DAYS = 30
+# Tasks moved per archive_done transaction when the caller batches, so
+# readers and other writers wait for one batch rather than the whole backlog
+ARCHIVE_BATCH = 5000
+ARCHIVE_COLUMNS = "task_id, title, due_date, priority, category, status, course_id, created_at, completed_at, series_id, series_day"
+
+# Recurring tasks: occurrences due from today up to this many days ahead
+# are listed and scored. Earlier ones that were never completed lapse.
+RECURRENCE_DAYS = 14
+
+# Words of a title or category, for the relevance order of search_tasks
+_WORD_RE = re.compile(r"\w+")
+
+# Day number (see epoch_day) of a YYYY-MM-DD column, as in the due_day column
+_EPOCH_DAY_SQL = "CAST(julianday({}) - 2440587.5 AS INTEGER)"
+
+# Columns selected by every task query read through Task.from_row
+TASK_COLUMNS = """
+                t.task_id,
+                t.title,
+                t.due_date,
+                t.priority,
+                t.category,
+                t.status,
+                t.course_id,
+                c.code,
+                t.created_at,
+                t.due_day"""
+
+# Smart score (see Task.calculate_smart_score) as an SQL expression over
+# tasks t, relative to the :today parameter (a day number, see epoch_day).
+# Both urgency cases reduce to MAX(0, 100 - days * 10) (it is 100 + |days| * 10
+# when days <= 0), so due_day, a computed column, is evaluated once per row.
+_DAYS_LEFT_SQL = "(t.due_day - :today)"
+SCORE_SQL = f"""CAST(
+    MAX(0, 100 - {_DAYS_LEFT_SQL} * 10) * 0.7
+    + (CASE t.priority WHEN 'High' THEN 3 WHEN 'Medium' THEN 2 ELSE 1 END) * 10 * 0.3
+AS INTEGER)"""
+
+# Sort key of each page order; rows are always ordered by (key, task_id).
+# Score is negated so that the highest score comes first.
+PAGE_ORDERS = {
+    "id": "t.task_id",
+    "due": "t.due_day",
+    "score": f"-{SCORE_SQL}",
+}
+
+# Python equivalents of the keyset comparisons get_task_page uses
+PAGE_BOUNDS = {">": operator.gt, ">=": operator.ge, "<": operator.lt}
+
+# Top-K pending tasks by smart score. Within one priority the score never
+# rises as the due date moves later, so the K most urgent tasks of each
+# level are the first K of its (status, priority, due_day) index range;
+# merging those short lists gives the exact overall top K. Any other
+# priority scores like Low and has its own (normally empty) partial index.
+URGENT_BRANCHES = (
+    ("", "t.priority = 'High'"),
+    ("", "t.priority = 'Medium'"),
+    ("", "t.priority = 'Low'"),
+    (" INDEXED BY idx_tasks_other_priority_day", "(t.priority IS NULL OR t.priority NOT IN ('High', 'Medium', 'Low'))"),
+)
+URGENT_SQL = " UNION ALL ".join(f"""
+    SELECT * FROM (
+        SELECT{TASK_COLUMNS}, {SCORE_SQL} AS score
+        FROM tasks t{indexed_by}
+        LEFT JOIN courses c ON t.course_id = c.course_id
+        WHERE t.status = 'Pending' AND {condition}
+        ORDER BY t.due_day, t.task_id LIMIT :k
+    )""" for indexed_by, condition in URGENT_BRANCHES) + " ORDER BY score DESC, due_day, task_id LIMIT :k"
+
+STATEMENT_CACHE = 256 # Prepared statements the sqlite3 module keeps per connection
+
+# One SQLite connection plus the cursors DatabaseManager methods run on
+class PooledConnection:
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.task_cursor = conn.cursor() # Returns Task objects instead of tuples
+        self.task_cursor.row_factory = Task.from_row
+        self.tx_depth = 0 # Open transaction() blocks, commits are deferred while > 0
 
 # Database file for Academic Task Manager
 # Handles all database operations using SQLite
+#
+# Connections: there is one writer connection, used by every thread by
+# default. A thread that calls bind_reader() gets its own read-only
+# connection instead, so with the WAL journal (tune()) several threads can
+# read in parallel with each other and with the writer. conn, cursor and
+# task_cursor always refer to the calling thread's connection.
 class DatabaseManager:
-    def __init__(self, db_name="academic_pro.db"):
-        self.conn = sqlite3.connect(db_name, check_same_thread=False)
-        self.cursor = self.conn.cursor()
+    def __init__(self, db_name="academic_pro.db", tune=False):
+        self.db_name = db_name
+        self.tuning = () # PRAGMAs from tune() that reader connections repeat
+        self.local = threading.local() # .pooled: reader connection of the thread
+        self.readers = [] # Every reader connection, closed by close()
+        self.pool_lock = threading.Lock()
+        self.writer = self.open_connection()
+        self.watch = self.open_connection() # Only runs PRAGMA data_version, see change_token
+        self.watch_lock = threading.Lock()
+        self.write_count = 0 # Commits made through this manager, part of change_token()
+        self.dashboard = None # Cached DashboardSnapshot, see get_dashboard
+        self.upgrade_notes = [] # Messages about data changed by migrate(), for the user
+        if tune: self.tune()
         self.setup_db()
 
+    def open_connection(self, query_only=False):
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, cached_statements=STATEMENT_CACHE)
+        if query_only: conn.execute("PRAGMA query_only = ON")
+        for pragma in self.tuning: conn.execute(pragma)
+        return PooledConnection(conn)
+
+    # Give the calling thread its own read-only connection (idempotent).
+    # An in-memory database cannot be shared, there the writer is used
+    # (DatabaseWorker starts no reader threads for it).
+    def bind_reader(self):
+        if getattr(self.local, "pooled", None) is None and self.db_name != ":memory:":
+            pooled = self.open_connection(query_only=True)
+            with self.pool_lock: self.readers.append(pooled)
+            self.local.pooled = pooled
+        return self.pooled
+
+    # Connection of the calling thread: its reader after bind_reader(), otherwise the writer
+    @property
+    def pooled(self):
+        return getattr(self.local, "pooled", None) or self.writer
+
+    @property
+    def conn(self):
+        return self.pooled.conn
+
+    @property
+    def cursor(self):
+        return self.pooled.cursor
+
+    @property
+    def task_cursor(self):
+        return self.pooled.task_cursor
+
+    @property
+    def tx_depth(self):
+        return self.pooled.tx_depth
+
+    @tx_depth.setter
+    def tx_depth(self, value):
+        self.pooled.tx_depth = value
+
+    def close(self):
+        with self.pool_lock: readers, self.readers = self.readers, []
+        for pooled in readers + [self.watch, self.writer]: pooled.conn.close()
+
+    # Opt-in connection tuning: WAL journal, fewer fsyncs, bigger page cache
+    # and memory-mapped reads. cache_size_kb and mmap_size are in KiB / bytes.
+    # Cache and mmap sizes also apply to reader connections opened later.
+    def tune(self, wal=True, synchronous="NORMAL", cache_size_kb=20000, mmap_size=256 * 1024 * 1024):
+        self.tuning = (f"PRAGMA cache_size=-{int(cache_size_kb)}", f"PRAGMA mmap_size={int(mmap_size)}")
+        cursor = self.writer.cursor
+        if wal: cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        for pragma in self.tuning: cursor.execute(pragma)
+
+    # Groups several operations into one commit:
+    #     with db.transaction():
+    #         db.add_task(...); db.mark_done(...)
+    # Blocks can be nested; everything is rolled back if an error escapes.
+    @contextmanager
+    def transaction(self):
+        self.tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.tx_depth -= 1
+            if self.tx_depth == 0: self.conn.rollback()
+            raise
+        self.tx_depth -= 1
+        if self.tx_depth == 0: self.conn.commit(); self.write_count += 1
+
+    # Commit unless a transaction() block will commit later
+    def commit(self):
+        if self.tx_depth == 0: self.conn.commit(); self.write_count += 1
+
+    # Cheap token that changes whenever the data may have changed:
+    # PRAGMA data_version moves on commits from other connections or
+    # processes, write_count on commits made through this manager.
+    # It is read on a connection of its own so every thread sees the same value.
+    def change_token(self):
+        with self.watch_lock:
+            return (self.watch.cursor.execute("PRAGMA data_version").fetchone()[0], self.write_count)
+
+    # Dashboard snapshot, recomputed only when change_token() or the date
+    # changed since the last call; otherwise the cached object is returned
+    def get_dashboard(self, today=None):
+        today = today or datetime.date.today()
+        token = (self.change_token(), today)
+        if self.dashboard is None or self.dashboard.token != token:
+            self.dashboard = build_dashboard(self.get_summary(today=today), token, today, self.get_course_stats(today))
+        return self.dashboard
+
     # Create required tables if they do not exist
     def setup_db(self):
         self.cursor.execute("""
@@ -30,6 +500,33 @@ class DatabaseManager:
             )
         """)
         self.conn.commit()
+        self.migrate()
+
+    # Upgrade an existing database file in place to the latest schema version
+    def migrate(self):
+        version = self.cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version < len(MIGRATIONS):
+            self.conn.create_function("normalize_date", 1, _normalize_date, deterministic=True)
+        for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            note = MIGRATION_NOTES.get(number)
+            count = self.cursor.execute(note[0]).fetchone()[0] if note else 0
+            # executescript commits first, so each step is applied as one transaction
+            try:
+                self.conn.executescript(
+                    "BEGIN;\n" + script + f"\nPRAGMA user_version = {number};\nCOMMIT;"
+                )
+            except sqlite3.Error:
+                if self.conn.in_transaction: self.conn.rollback()
+                raise
+            if count: self.upgrade_notes.append(note[1].format(count))
+        # Statistics from an earlier ANALYZE do not cover indexes a migration
+        # created, and the planner would favour those unmeasured indexes
+        # (e.g. sorting id pages instead of walking idx_tasks_status)
+        if version < len(MIGRATIONS) and self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone():
+            self.conn.execute("ANALYZE")
+            self.conn.commit()
 
     # Add new category/course to database
     def add_course(self, course_obj):
@@ -38,60 +535,490 @@ class DatabaseManager:
                 "INSERT INTO courses (name, code) VALUES (?, ?)",
                 (course_obj.name, course_obj.code)
             )
-            self.conn.commit()
+            self.commit()
         except Exception:
             pass   # Ignore duplicate category entry
 
+    # Map of course code -> course_id, registering any codes that are missing.
+    # names (code -> name) sets the name of new and existing courses; other
+    # new courses are named after their code.
+    def ensure_courses(self, codes, names=None):
+        codes = list(codes)
+        names = names or {}
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO courses (name, code) VALUES (?, ?)",
+            ((names.get(code, code), code) for code in codes)
+        )
+        self.cursor.executemany(
+            "UPDATE courses SET name = ?1 WHERE code = ?2 AND name IS NOT ?1",
+            ((name, code) for code, name in names.items())
+        )
+        self.commit()
+        found = {}
+        for i in range(0, len(codes), 500): # Stay below SQLite's host parameter limit
+            chunk = codes[i:i + 500]
+            found.update(self.cursor.execute(
+                f"SELECT code, course_id FROM courses WHERE code IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall())
+        return found
+
+    def get_courses(self):
+        return self.cursor.execute("SELECT course_id, name, code FROM courses").fetchall()
+
+    # course_id of a category code, None if it is not registered
+    def get_course_id(self, code):
+        row = self.cursor.execute("SELECT course_id FROM courses WHERE code = ?", (code,)).fetchone()
+        return row[0] if row else None
+
+    # Per-category progress from the trigger-maintained course_stats table:
+    # (code, name, pending_count, done_count, next pending due date).
+    # Costs one row per category, however many tasks there are.
+    # Occurrences of recurring tasks due by today count as pending like in
+    # get_summary; the next due date looks RECURRENCE_DAYS days ahead.
+    def get_course_stats(self, today=None):
+        rows = self.cursor.execute("""
+            SELECT c.code, c.name, COALESCE(s.pending_count, 0), COALESCE(s.done_count, 0), s.next_due
+            FROM courses c
+            LEFT JOIN course_stats s ON s.course_id = c.course_id
+            ORDER BY c.course_id
+        """).fetchall()
+        day = epoch_day(today or datetime.date.today())
+        occurrences = collections.Counter()
+        first_due = {}
+        for t in self.iter_occurrences(day, day + RECURRENCE_DAYS):
+            if t.due_day <= day: occurrences[t.code] += 1
+            first_due.setdefault(t.code, t.due_date)
+        if not first_due: return rows
+        return [(code, name, pending + occurrences[code], done,
+                 min(d for d in (next_due, first_due.get(code)) if d is not None) if code in first_due else next_due)
+                for code, name, pending, done, next_due in rows]
+
     def delete_course(self, course_code):
         self.cursor.execute(
             "DELETE FROM tasks WHERE category = ?",
             (course_code,)
         )
+        self.cursor.execute(
+            "DELETE FROM tasks_archive WHERE category = ?",
+            (course_code,)
+        )
+        self.cursor.execute(
+            "DELETE FROM series_skips WHERE series_id IN (SELECT series_id FROM task_series WHERE category = ?)",
+            (course_code,)
+        )
+        self.cursor.execute(
+            "DELETE FROM task_series WHERE category = ?",
+            (course_code,)
+        )
         self.cursor.execute(
             "DELETE FROM courses WHERE code = ?",
             (course_code,)
         )
-        self.conn.commit()
+        self.commit()
 
     def add_task(self, title, due, prio, cat, cid):
         self.cursor.execute(
-            "INSERT INTO tasks (title, due_date, priority, category, course_id) VALUES (?, ?, ?, ?, ?)",
+            "INSERT INTO tasks (title, due_date, priority, category, course_id, created_at) VALUES (?, ?, ?, ?, ?, date('now', 'localtime'))",
             (title, due, prio, cat, cid)
         )
-        self.conn.commit()
+        self.commit()
 
-    def update_task_details(self, tid, title, due, prio):
+    # Recurring task repeating every 'every_days' days from 'start' (a date
+    # string) up to 'until' (None: no end); nothing is written per occurrence
+    def add_series(self, title, start, every_days, until, prio, cat, cid):
         self.cursor.execute(
-            "UPDATE tasks SET title = ?, due_date = ?, priority = ? WHERE task_id = ?",
-            (title, due, prio, tid)
+            "INSERT INTO task_series (title, priority, category, course_id, start_date, every_days, until_date, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, date('now', 'localtime'))",
+            (title, prio, cat, cid, start, every_days, until)
         )
-        self.conn.commit()
+        self.commit()
+
+    # Task ids of the update / delete methods may be occurrence ids (see
+    # models.occurrence_id). Writes the tasks row of each such occurrence
+    # (copied from its series) unless it exists already and returns the
+    # real task ids, None when the series is gone or has no such occurrence.
+    def resolve_task_ids(self, tids):
+        tids = [int(tid) for tid in tids]
+        slots = [split_occurrence_id(tid) for tid in tids if tid < 0]
+        if not slots: return tids
+        with self.transaction():
+            self.cursor.executemany(f"""
+                INSERT INTO tasks (title, due_date, priority, category, course_id, created_at, series_id, series_day)
+                SELECT title, ?3, priority, category, course_id, date('now', 'localtime'), series_id, ?2
+                FROM task_series
+                WHERE series_id = ?1 AND ?3 >= start_date AND (until_date IS NULL OR ?3 <= until_date)
+                  AND (?2 - {_EPOCH_DAY_SQL.format("start_date")}) % every_days = 0
+                  AND NOT EXISTS (SELECT 1 FROM series_skips WHERE series_id = ?1 AND series_day = ?2)
+                ON CONFLICT DO NOTHING
+            """, ((sid, day, day_date(day)) for sid, day in slots))
+        found = {}
+        for sid, day in slots:
+            row = self.cursor.execute(
+                "SELECT task_id FROM tasks WHERE series_id = ? AND series_day = ?", (sid, day)
+            ).fetchone()
+            found[sid, day] = row and row[0]
+        return [found[split_occurrence_id(tid)] if tid < 0 else tid for tid in tids]
+
+    def update_task_details(self, tid, title, due, prio):
+        with self.transaction():
+            tid = self.resolve_task_ids([tid])[0]
+            self.cursor.execute(
+                "UPDATE tasks SET title = ?, due_date = ?, priority = ? WHERE task_id = ?",
+                (title, due, prio, tid)
+            )
 
     def mark_done(self, tid):
-        self.cursor.execute(
-            "UPDATE tasks SET status = 'Done' WHERE task_id = ?",
-            (tid,)
-        )
-        self.conn.commit()
+        self.mark_done_many([tid])
+
+    # Stop recurring tasks: for each given task (an occurrence id, or a
+    # stored occurrence) its series gets no more occurrences from that
+    # task's day on; stored ones stay. A series left without any
+    # occurrence is removed. Returns the number of series changed.
+    def end_series(self, tids):
+        slots = []
+        for tid in map(int, tids):
+            if tid < 0:
+                slots.append(split_occurrence_id(tid))
+                continue
+            slots += self.cursor.execute("""
+                SELECT series_id, series_day FROM tasks WHERE task_id = ?1 AND series_id IS NOT NULL
+                UNION ALL
+                SELECT series_id, series_day FROM tasks_archive WHERE task_id = ?1 AND series_id IS NOT NULL
+            """, (tid,)).fetchall()
+        if not slots: return 0
+        with self.transaction():
+            self.cursor.executemany(
+                "UPDATE task_series SET until_date = ?2 WHERE series_id = ?1 AND (until_date IS NULL OR until_date >= ?2)",
+                ((sid, day_date(day - 1)) for sid, day in slots)
+            )
+            ended = self.cursor.rowcount
+            self.cursor.execute("DELETE FROM task_series WHERE until_date < start_date")
+            self.cursor.execute("DELETE FROM series_skips WHERE series_id NOT IN (SELECT series_id FROM task_series)")
+        return ended
 
+    # Deletes the task wherever it is, in tasks or in the archive
     def delete_task(self, tid):
-        self.cursor.execute(
-            "DELETE FROM tasks WHERE task_id = ?",
-            (tid,)
+        self.delete_many([tid])
+
+    # Bulk variants: one executemany and one commit for many rows
+    # rows: iterable of (title, due, prio, cat, cid) or (title, due, prio, cat, cid, status).
+    # Tasks added as Done get no completion date, like those from before it was stored.
+    def add_tasks(self, rows):
+        self.cursor.executemany(
+            "INSERT INTO tasks (title, due_date, priority, category, course_id, status, created_at) "
+            "VALUES (?1, ?2, ?3, ?4, ?5, COALESCE(?6, 'Pending'), date('now', 'localtime'))",
+            (r if len(r) == 6 else (*r, None) for r in rows)
         )
-        self.conn.commit()
+        self.commit()
 
-    def get_tasks(self):
-        return self.cursor.execute("""
-            SELECT
-                t.task_id,
-                t.title,
-                t.due_date,
-                t.priority,
-                t.category,
-                t.status,
-                t.course_id,
-                c.code
+    def mark_done_many(self, tids):
+        with self.transaction():
+            self.cursor.executemany(
+                "UPDATE tasks SET status = 'Done', completed_at = date('now', 'localtime') WHERE task_id = ? AND status <> 'Done'",
+                ((tid,) for tid in self.resolve_task_ids(tids))
+            )
+
+    # Deleting an occurrence of a recurring task, stored or not, skips that
+    # day of its series (see end_series to stop the whole series)
+    def delete_many(self, tids):
+        tids = [int(tid) for tid in tids]
+        with self.transaction():
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO series_skips (series_id, series_day) VALUES (?, ?)",
+                (split_occurrence_id(tid) for tid in tids if tid < 0)
+            )
+            for table in ("tasks", "tasks_archive"):
+                self.cursor.executemany(f"""
+                    INSERT OR IGNORE INTO series_skips (series_id, series_day)
+                    SELECT series_id, series_day FROM {table} WHERE task_id = ? AND series_id IS NOT NULL
+                """, ((tid,) for tid in tids if tid > 0))
+                self.cursor.executemany(
+                    f"DELETE FROM {table} WHERE task_id = ?",
+                    ((tid,) for tid in tids if tid > 0)
+                )
+
+    # Move tasks completed more than 'older_than_days' days ago out of the
+    # working table into tasks_archive, so pending queries and indexes stay
+    # small however much history there is. Page, search, export and
+    # summary queries read both tables. Returns the number of tasks moved.
+    # Done tasks without a completion date (see migration 6) always move.
+    # With a batch size at most that many tasks move per call: call again
+    # while it returns batch (see ARCHIVE_BATCH).
+    def archive_done(self, older_than_days=ARCHIVE_AFTER_DAYS, today=None, batch=None):
+        cutoff = str((today or datetime.date.today()) - datetime.timedelta(days=older_than_days))
+        due = "status = 'Done' AND (completed_at IS NULL OR completed_at < :cutoff)"
+        # Nothing to move: no write, so the change token stays the same
+        if not self.cursor.execute(f"SELECT 1 FROM tasks WHERE {due} LIMIT 1", {"cutoff": cutoff}).fetchone(): return 0
+        if batch:
+            # tasks does not change between the two statements, so both pick the same rows
+            due = f"task_id IN (SELECT task_id FROM tasks WHERE {due} LIMIT :batch)"
+        params = {"cutoff": cutoff, "batch": batch}
+        with self.transaction():
+            self.cursor.execute(f"""
+                INSERT INTO tasks_archive ({ARCHIVE_COLUMNS})
+                SELECT {ARCHIVE_COLUMNS} FROM tasks WHERE {due}
+            """, params)
+            moved = self.cursor.rowcount
+            self.cursor.execute(f"DELETE FROM tasks WHERE {due}", params)
+        return moved
+
+    # Streams (title, due_date, priority, category, status) rows with fetchmany,
+    # on its own cursor so memory stays flat for any table size.
+    # Archived tasks are included, everything comes in task_id order.
+    def iter_task_rows(self, chunk_size=1000):
+        cur = self.conn.cursor()
+        cur.execute("""
+            SELECT task_id, title, due_date, priority, category, status FROM tasks
+            UNION ALL
+            SELECT task_id, title, due_date, priority, category, status FROM tasks_archive
+            ORDER BY task_id
+        """)
+        try:
+            while True:
+                rows = cur.fetchmany(chunk_size)
+                if not rows: break
+                for row in rows: yield row[1:]
+        finally:
+            cur.close()
+
+    # All tasks of the working table; archived=True adds the archive
+    def get_tasks(self, archived=False):
+        sql = f"""
+            SELECT{TASK_COLUMNS}
             FROM tasks t
+            LEFT JOIN courses c ON t.course_id = c.course_id"""
+        if archived:
+            sql += " UNION ALL" + sql.replace("FROM tasks t", "FROM tasks_archive t")
+        return self.task_cursor.execute(sql).fetchall()
+
+    # Dashboard summary computed with aggregate and LIMIT queries, so its
+    # cost does not grow with the number of completed tasks.
+    # Pending means status 'Pending' so the (status, ...) indexes are used.
+    def get_summary(self, top_n=3, today=None):
+        today = today or datetime.date.today()
+        # Counts come from course_stats, plus the (normally no) tasks without a course
+        pending, done = self.cursor.execute(
+            "SELECT COALESCE(SUM(pending_count), 0), COALESCE(SUM(done_count), 0) FROM course_stats"
+        ).fetchone()
+        for status, count in self.cursor.execute("""
+            SELECT status, COUNT(*) FROM tasks WHERE course_id IS NULL GROUP BY status
+            UNION ALL
+            SELECT 'Done', COUNT(*) FROM tasks_archive WHERE course_id IS NULL
+        """).fetchall():
+            if status == "Pending": pending += count
+            elif status == "Done": done += count
+        # Occurrences of recurring tasks in the next RECURRENCE_DAYS days are
+        # listed as pending and compete for urgent and nearest. Only the ones
+        # already due count: future ones would inflate pending and total.
+        day = epoch_day(today)
+        occurrences = list(self.iter_occurrences(day, day + RECURRENCE_DAYS))
+        due = [t for t in occurrences if t.due_day <= day]
+        pending += len(due)
+
+        nearest = self.cursor.execute("""
+            SELECT title, due_date, due_day FROM tasks
+            WHERE status = 'Pending'
+            ORDER BY due_day, task_id LIMIT 1
+        """).fetchone()
+        if occurrences and (nearest is None or occurrences[0].due_day < nearest[2]):
+            nearest = (occurrences[0].title, occurrences[0].due_date, occurrences[0].due_day)
+        # The first top_n are urgent, the next top_n are planned for later
+        urgent = [t.title for t in self.get_urgent_tasks(top_n * 2, today)]
+        high_pending = self.cursor.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status = 'Pending' AND priority = 'High'"
+        ).fetchone()[0] + sum(1 for t in due if t.priority == "High")
+        overdue, due_today = self.cursor.execute("""
+            SELECT COALESCE(SUM(due_day < ?), 0), COALESCE(SUM(due_day = ?), 0) FROM tasks
+            WHERE status = 'Pending' AND due_day <= ?
+        """, (day, day, day)).fetchone()
+        due_today += len(due)
+
+        return {
+            "total": pending + done,
+            "done": done,
+            "pending": pending,
+            "high_pending": high_pending,
+            "overdue": overdue,
+            "due_today": due_today,
+            "nearest": nearest,   # (title, due_date, due_day) or None
+            "urgent": urgent[:top_n],
+            "upcoming": urgent[top_n:],
+        }
+
+    # The k pending tasks with the highest smart score, most urgent first,
+    # as Task objects whose 'key' is the score. Reads at most 4 * k index
+    # entries, so it stays cheap however many tasks are pending.
+    # Occurrences of recurring tasks compete too: per series only the first
+    # k in the next RECURRENCE_DAYS days can make it, so only those are scored.
+    def get_urgent_tasks(self, k=3, today=None):
+        today = today or datetime.date.today()
+        day = epoch_day(today)
+        tasks = self.task_cursor.execute(URGENT_SQL, {"k": k, "today": day}).fetchall()
+        occurrences = list(self.iter_occurrences(day, day + RECURRENCE_DAYS, per_series=k))
+        if not occurrences: return tasks
+        for t in occurrences: t.key = t.calculate_smart_score(today)
+        return sorted(tasks + occurrences, key=lambda t: (-t.key, t.due_day, t.task_id))[:k]
+
+    # (due_day, priority) of every pending task as two lists, read from the
+    # (status, priority, due_day) index alone. It has to be named: the
+    # planner does not count an index as covering a computed column.
+    def get_pending_columns(self):
+        rows = self.cursor.execute(
+            "SELECT due_day, priority FROM tasks INDEXED BY idx_tasks_status_priority_day WHERE status = 'Pending'"
+        ).fetchall()
+        return [r[0] for r in rows], [r[1] for r in rows]
+
+    # Number of tasks completed from 'start' to 'end' (dates, inclusive),
+    # archived ones included
+    def count_completed(self, start, end):
+        return self.cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM tasks WHERE status = 'Done' AND completed_at BETWEEN ?1 AND ?2)
+                 + (SELECT COUNT(*) FROM tasks_archive WHERE completed_at BETWEEN ?1 AND ?2)
+        """, (str(start), str(end))).fetchone()[0]
+
+    # Lazily yields the not yet stored occurrences of every recurring task
+    # due from first_day to last_day (day numbers), ordered by (due_day,
+    # task_id) like the due_day queries. per_series caps each series.
+    # Callers start at today at the earliest: missed occurrences lapse.
+    def iter_occurrences(self, first_day, last_day, per_series=None):
+        series = [Series(*row) for row in self.cursor.execute(f"""
+            SELECT s.series_id, s.title, s.priority, s.category, s.course_id, c.code,
+                   {_EPOCH_DAY_SQL.format("s.start_date")}, s.every_days, {_EPOCH_DAY_SQL.format("s.until_date")}
+            FROM task_series s
+            LEFT JOIN courses c ON s.course_id = c.course_id
+            WHERE s.start_date <= :last AND (s.until_date IS NULL OR s.until_date >= :first)
+        """, {"first": day_date(first_day), "last": day_date(last_day)}).fetchall()]
+        if not series: return
+        taken = collections.defaultdict(set) # series_id -> days that have a tasks row or were deleted
+        for sid, day in self.cursor.execute("""
+            SELECT series_id, series_day FROM tasks WHERE series_id IS NOT NULL AND series_day BETWEEN ?1 AND ?2
+            UNION ALL
+            SELECT series_id, series_day FROM tasks_archive WHERE series_id IS NOT NULL AND series_day BETWEEN ?1 AND ?2
+            UNION ALL
+            SELECT series_id, series_day FROM series_skips WHERE series_day BETWEEN ?1 AND ?2
+        """, (first_day, last_day)).fetchall():
+            taken[sid].add(day)
+        yield from heapq.merge(*(
+            itertools.islice(s.occurrences(first_day, last_day, taken[s.series_id]), per_series) for s in series
+        ), key=lambda t: (t.due_day, t.task_id))
+
+    # Tasks due between two dates (datetime.date, both inclusive), earliest
+    # first, read from the due_day indexes. limit=None returns every match.
+    # Returns Task objects; 'Done' includes the archive like get_task_page,
+    # 'Pending' the occurrences of recurring tasks due from today on.
+    def due_between(self, start, end, status="Pending", limit=None, today=None):
+        sql = " UNION ALL ".join(f"""
+            SELECT{TASK_COLUMNS}
+            FROM {table} t
             LEFT JOIN courses c ON t.course_id = c.course_id
-        """).fetchall()
+            WHERE {status_where} AND t.due_day BETWEEN :start AND :end""" for table, status_where in self.task_sources(status))
+        tasks = self.task_cursor.execute(sql + " ORDER BY due_day, task_id LIMIT :limit", {
+            "status": status, "start": epoch_day(start), "end": epoch_day(end),
+            "limit": -1 if limit is None else limit}).fetchall()
+        if status != "Pending": return tasks
+        first = epoch_day(max(start, today or datetime.date.today()))
+        merged = heapq.merge(tasks, self.iter_occurrences(first, epoch_day(end)), key=lambda t: (t.due_day, t.task_id))
+        return list(itertools.islice(merged, limit))
+
+    # Pending tasks whose due date has passed
+    def overdue(self, today=None, limit=None):
+        today = today or datetime.date.today()
+        return self.due_between(datetime.date.min, today - datetime.timedelta(days=1), limit=limit, today=today)
+
+    # Pending tasks due today or within the next 'days' days
+    def due_within(self, days, today=None, limit=None):
+        today = today or datetime.date.today()
+        return self.due_between(today, today + datetime.timedelta(days=days), limit=limit, today=today)
+
+    # Keyset pagination over one status ('Pending' or 'Done').
+    # Returns Task objects whose 'key' holds the sort key value;
+    # page_key(task) gives the cursor to pass as after/start/before.
+    # after: rows strictly after the key, start: rows from the key onwards,
+    # before: the page just before the key (still returned in display order).
+    # 'Done' pages merge the working table with the archive, 'Pending' pages
+    # the recurring occurrences of the next RECURRENCE_DAYS days.
+    def get_task_page(self, status, order="id", after=None, start=None, before=None, limit=200, today=None):
+        key_sql = PAGE_ORDERS[order]
+        today = today or datetime.date.today()
+        params = {"status": status, "limit": limit, "today": epoch_day(today)}
+        where = ""
+        direction = "ASC"
+        op = None
+        bound = next((k for k in (after, start, before) if k is not None), None)
+        if bound is not None:
+            op = ">" if after is not None else (">=" if start is not None else "<")
+            if order == "id":
+                where = f" AND t.task_id {op} :tid"
+            else:
+                where = f" AND ({key_sql}, t.task_id) {op} (:key, :tid)"
+            params["key"], params["tid"] = bound
+            if before is not None: direction = "DESC"
+        order_sql = f"task_id {direction}" if order == "id" else f"sort_key {direction}, task_id {direction}"
+
+        sql = " UNION ALL ".join(f"""
+            SELECT{TASK_COLUMNS},
+                {key_sql} AS sort_key
+            FROM {table} t
+            LEFT JOIN courses c ON t.course_id = c.course_id
+            WHERE {status_where}{where}""" for table, status_where in self.task_sources(status))
+        rows = self.task_cursor.execute(sql + f" ORDER BY {order_sql} LIMIT :limit", params).fetchall()
+        if before is not None: rows.reverse()
+        if status == "Pending":
+            rows = self.merge_occurrences(rows, order, op, bound, before is not None, limit, today)
+        return rows
+
+    # Adds the occurrences of the next RECURRENCE_DAYS days to a Pending page
+    # (rows in display order), applying the same page bound and order
+    def merge_occurrences(self, rows, order, op, bound, from_end, limit, today):
+        day = epoch_day(today)
+        extra = []
+        for t in self.iter_occurrences(day, day + RECURRENCE_DAYS):
+            t.key = t.task_id if order == "id" else (t.due_day if order == "due" else -t.calculate_smart_score(today))
+            if op is None or PAGE_BOUNDS[op](self.page_key(t), bound): extra.append(t)
+        if not extra: return rows
+        rows = sorted(rows + extra, key=self.page_key)
+        return rows[-limit:] if from_end else rows[:limit]
+
+    # (table, condition) pairs holding the tasks of a status (None: all)
+    @staticmethod
+    def task_sources(status):
+        if status == "Pending": return [("tasks", "t.status = :status")]
+        if status == "Done": return [("tasks", "t.status = :status"), ("tasks_archive", "1")]
+        return [("tasks", "1"), ("tasks_archive", "1")]
+
+    # Full-text search over title and category with prefix matching.
+    # Every word of the query must match the start of a word in the task.
+    # The status is a column of tasks_fts, so FTS5 filters by it while it
+    # walks the matches. Only the newest 'candidates' matches are read;
+    # they are ordered by how many query words they contain as whole
+    # words, then newest first. (bm25 counts the rows of every term, which
+    # for common prefixes and the status term took longer than the search.)
+    # Returns Task objects like get_task_page, with that count as 'key'.
+    # The archive is searched too unless status is 'Pending'.
+    def search_tasks(self, query, status=None, limit=200, candidates=None):
+        words = [w for w in query.replace('"', '').split() if w]
+        if not words: return []
+        match = "{title category} : (" + " ".join(f'"{w}"*' for w in words) + ")"
+        sql = " UNION ALL ".join(f"""
+            SELECT{TASK_COLUMNS}
+            FROM (
+                SELECT rowid FROM {table}_fts
+                WHERE {table}_fts MATCH {":match" if status_where == "1" else ":status_match"}
+                ORDER BY rowid DESC LIMIT :candidates
+            ) f
+            JOIN {table} t ON t.task_id = f.rowid
+            LEFT JOIN courses c ON t.course_id = c.course_id""" for table, status_where in self.task_sources(status))
+        tasks = self.task_cursor.execute(sql, {
+            "match": match, "status_match": f'{match} AND status : "{status}"',
+            "candidates": candidates or limit * 2}).fetchall()
+        wanted = {w.lower() for w in words}
+        for t in tasks:
+            t.key = len(wanted.intersection(_WORD_RE.findall(f"{t.title} {t.category}".lower())))
+        tasks.sort(key=lambda t: (-t.key, -t.task_id))
+        return tasks[:limit]
+
+    # Cursor value of a task returned by get_task_page
+    @staticmethod
+    def page_key(task):
+        return (task.key, task.task_id)
@@ -0,0 +1,192 @@
+# Workload forecast for the Academic Task Manager
+# Projects the pending backlog day by day over a horizon (30 to 90 days)
+# for several scenarios at once. Every day the user completes the most
+# urgent pending tasks by smart score, as many as their completion rate
+# over the last HISTORY_DAYS days (or a fixed number a day); skipped days
+# complete nothing. Scores are recomputed for each day, so tasks climb as
+# their deadlines come closer and keep climbing once overdue.
+#
+#   python cli.py forecast --days 60
+#
+# With NumPy every scenario is one row of an array and each day is a few
+# array operations; without it the same model runs in plain Python.
+import collections
+import datetime
+import heapq
+import math
+
+from models import PRIORITY_VALUES, _numpy, array_scores, epoch_day, score_for
+
+HISTORY_DAYS = 28      # Completion rate = tasks completed in this many days before today / HISTORY_DAYS
+DEFAULT_HORIZON = 60   # Days projected by default
+CHECKPOINTS = (1, 3, 7, 14, 30, 60, 90) # Days after which table() reports the backlog
+
+# skip_days: days from today on which nothing gets done;
+# per_day: tasks completed a day, None for the historical completion rate
+Scenario = collections.namedtuple("Scenario", ("name", "skip_days", "per_day"))
+
+SCENARIOS = (
+    Scenario("Usual pace", 0, None),
+    Scenario("Skip 1 day", 1, None),
+    Scenario("Skip 3 days", 3, None),
+    Scenario("2 tasks/day", 0, 2),
+)
+
+# Result of forecast(). pending, overdue and mean_score have one row per
+# scenario and one column per day (column 0 is today), measured at the end
+# of that day: tasks still pending, how many of them are past their
+# deadline the next morning, and their mean smart score.
+Forecast = collections.namedtuple("Forecast", ("scenarios", "start", "rate", "pending", "overdue", "mean_score"))
+
+
+# Tasks completed per day over the HISTORY_DAYS days before today
+def completion_rate(db, today=None):
+    today = today or datetime.date.today()
+    return db.count_completed(today - datetime.timedelta(days=HISTORY_DAYS), today - datetime.timedelta(days=1)) / HISTORY_DAYS
+
+
+# Forecast for the tasks in the database: every pending task, plus the
+# occurrences of recurring tasks, which join the backlog on their due day
+def forecast_db(db, horizon=DEFAULT_HORIZON, today=None, scenarios=SCENARIOS):
+    today = today or datetime.date.today()
+    first = epoch_day(today)
+    due_days, priorities = db.get_pending_columns()
+    arrivals = [first] * len(due_days)
+    for t in db.iter_occurrences(first, first + horizon - 1):
+        due_days.append(t.due_day); priorities.append(t.priority); arrivals.append(t.due_day)
+    return forecast(due_days, priorities, completion_rate(db, today), horizon, today, scenarios, arrivals)
+
+
+# due_days: day numbers (see models.epoch_day), priorities: 'High' / ...,
+# arrivals: day number each task can be worked on from (default: today).
+# rate: tasks completed a day where a scenario has no per_day of its own.
+def forecast(due_days, priorities, rate, horizon=DEFAULT_HORIZON, today=None, scenarios=SCENARIOS, arrivals=None):
+    today = today or datetime.date.today()
+    first = epoch_day(today)
+    # Tasks each scenario can complete on each day, fractions carry over
+    capacity = [[0.0 if day < s.skip_days else (rate if s.per_day is None else s.per_day)
+                 for day in range(horizon)] for s in scenarios]
+    importance = [PRIORITY_VALUES.get(p, 1) * 10 for p in priorities]
+    if arrivals is None: arrivals = [first] * len(due_days)
+    np = _numpy()
+    run = _run_numpy if np else _run_python
+    pending, overdue, mean_score = run(due_days, importance, arrivals, capacity, first)
+    return Forecast(tuple(scenarios), today, rate, pending, overdue, mean_score)
+
+
+# Tasks done each day from the running capacity total: the whole part
+# is used, the fraction is kept for the next day
+def _daily_counts(capacity):
+    counts = []
+    for row in capacity:
+        carry, days = 0.0, []
+        for c in row:
+            carry += c
+            n = math.floor(carry + 1e-9)
+            carry -= n
+            days.append(n)
+        counts.append(days)
+    return counts
+
+
+# All scenarios as rows of a (scenarios x tasks) 'remaining' matrix. Each
+# day one argpartition finds every scenario's most urgent tasks.
+def _run_numpy(due_days, importance, arrivals, capacity, first):
+    np = _numpy()
+    due = np.array(due_days, dtype=np.int64)
+    imp = np.array(importance, dtype=np.int64)
+    arrive = np.array(arrivals, dtype=np.int64)
+    counts = np.array(_daily_counts(capacity), dtype=np.int64)
+    n_scen, horizon = counts.shape
+    remaining = np.ones((n_scen, len(due)), dtype=bool)
+    pending = np.zeros((n_scen, horizon), dtype=np.int64)
+    overdue = np.zeros((n_scen, horizon), dtype=np.int64)
+    mean_score = np.zeros((n_scen, horizon))
+    if not len(due): return pending, overdue, mean_score
+    spread = int(due.max() - due.min()) + 1
+    for step in range(horizon):
+        day = first + step
+        left = due - day
+        scores = array_scores(np, left, imp)
+        available = arrive <= day
+        k = counts[:, step]
+        top_k = min(int(k.max()), len(due))
+        if top_k:
+            # Highest score first, ties go to the earlier deadline
+            key = np.where(remaining & available, scores * spread - (due - due.min()), -1).astype(np.float64)
+            best = np.argpartition(-key, top_k - 1, axis=1)[:, :top_k]
+            best_key = np.take_along_axis(key, best, axis=1)
+            order = np.argsort(-best_key, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_key = np.take_along_axis(best_key, order, axis=1)
+            done = (np.arange(top_k) < k[:, None]) & (best_key >= 0)
+            rows, cols = np.nonzero(done)
+            remaining[rows, best[rows, cols]] = False
+        live = remaining & available
+        pending[:, step] = live.sum(axis=1)
+        overdue[:, step] = (live & (left <= 0)).sum(axis=1)
+        mean_score[:, step] = (live * scores).sum(axis=1) / np.maximum(pending[:, step], 1)
+    return pending, overdue, mean_score
+
+
+# Same model one scenario at a time, heapq.nlargest picks the day's tasks
+def _run_python(due_days, importance, arrivals, capacity, first):
+    counts = _daily_counts(capacity)
+    horizon = len(capacity[0]) if capacity else 0
+    remaining = [set(range(len(due_days))) for _ in capacity]
+    rows = [([], [], []) for _ in capacity] # pending, overdue, mean_score of each scenario
+    for step in range(horizon):
+        day = first + step
+        scores = [score_for(d - day, imp) for d, imp in zip(due_days, importance)]
+        for s, left in enumerate(remaining):
+            live = [i for i in left if arrivals[i] <= day]
+            if counts[s][step]:
+                for i in heapq.nlargest(counts[s][step], live, key=lambda i: (scores[i], -due_days[i])):
+                    left.discard(i)
+                live = [i for i in live if i in left]
+            p, o, m = rows[s]
+            p.append(len(live))
+            o.append(sum(1 for i in live if due_days[i] <= day))
+            m.append(sum(scores[i] for i in live) / len(live) if live else 0.0)
+    return [r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows]
+
+
+# The CHECKPOINTS days that fall within a horizon
+def checkpoints(horizon):
+    return [d for d in CHECKPOINTS if d <= horizon]
+
+
+# (scenario name, [(pending, overdue) after each checkpoint day]) per scenario
+def checkpoint_rows(result):
+    days = checkpoints(len(result.pending[0]))
+    return [(scen.name, [(int(result.pending[s][d - 1]), int(result.overdue[s][d - 1]), float(result.mean_score[s][d - 1]))
+                         for d in days])
+            for s, scen in enumerate(result.scenarios)]
+
+
+# Text table of a Forecast: one line per scenario with
+# 'pending/overdue/mean score' after each checkpoint day
+def table(result):
+    header = [""] + [f"day {d}" for d in checkpoints(len(result.pending[0]))]
+    rows = [header] + [[name] + [f"{p}/{o}/{m:.1f}" for p, o, m in cells] for name, cells in checkpoint_rows(result)]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = ["  ".join([row[0].ljust(widths[0])] + [cell.rjust(w) for cell, w in zip(row[1:], widths[1:])]) for row in rows]
+    lines[0] += "   (pending/overdue/mean score)"
+    return lines
+
+
+# One sentence on the first scenario that skips days compared with the
+# first one that does not (the question of the "What if I skip today?" button)
+def verdict(result):
+    base = next((s for s, scen in enumerate(result.scenarios) if not scen.skip_days), None)
+    skip = next((s for s, scen in enumerate(result.scenarios) if scen.skip_days), None)
+    if base is None or skip is None: return ""
+    if not result.pending[base][0] and not result.pending[skip][0]: return "Safe to take a break! 🏖️"
+    week = min(7, len(result.pending[base])) - 1
+    extra = int(result.overdue[skip][week] - result.overdue[base][week])
+    cleared = next((d + 1 for d, n in enumerate(result.pending[base]) if not n), None)
+    pace = f"At your pace ({result.rate:.1f} tasks/day) the backlog is " + (
+        f"cleared in {cleared} days." if cleared else f"not cleared within {len(result.pending[base])} days.")
+    name = result.scenarios[skip].name.lower()
+    if extra > 0: return f"Backlog danger! {name.capitalize()} leaves {extra} more tasks overdue after a week. 🛑 {pace}"
+    return f"{name.capitalize()} adds no overdue tasks this week. ⚖️ {pace}"
@@ -1,4 +1,51 @@
+import collections
 import datetime
+import sys
+
+np = None  # NumPy module once loaded, False when it is not installed
+
+# NumPy is optional (batch scoring falls back to plain Python) and is only
+# imported the first time it is needed, which keeps 'import models' cheap
+# for the command-line tool
+def _numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        np = numpy
+    return np
+
+# Importance value of each priority level, anything else counts as Low
+PRIORITY_VALUES = {"High": 3, "Medium": 2}
+
+# Due dates are also stored as day numbers: days since 1970-01-01
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+def epoch_day(day):
+    return day.toordinal() - EPOCH_ORDINAL
+
+# Inverse of epoch_day as a YYYY-MM-DD string
+def day_date(day):
+    return datetime.date.fromordinal(day + EPOCH_ORDINAL).isoformat()
+
+# Occurrences of recurring tasks that are not stored yet are listed with a
+# negative id made of the series id and the due day, so they can be told
+# apart from (and turned into) real task ids
+OCCURRENCE_SPAN = 1000000 # Day numbers stay below this until the year 4707
+
+def occurrence_id(series_id, day):
+    return -(series_id * OCCURRENCE_SPAN + day)
+
+# (series_id, day) of an occurrence id
+def split_occurrence_id(tid):
+    return divmod(-int(tid), OCCURRENCE_SPAN)
+
+# Return one shared copy of a repeated string value (None is passed through)
+def _shared(value):
+    return sys.intern(value) if type(value) is str else value
+
 # Course class represents academic category / goals.
 class Course:
     def __init__(self, course_id, name, code, instructor="N/A", credits=0):
@@ -9,9 +56,15 @@ class Course:
         self.credits = credits
         
 # Task class represents an academic task with deadline and priority
+# Uses __slots__ so large task lists stay small in memory; rows read from
+# the database are turned into Task objects directly by Task.from_row.
 class Task:
+    __slots__ = ("task_id", "title", "due_date", "priority", "category", "status",
+                 "course_id", "description", "code", "key", "_created_at", "due_day")
+
     def __init__(self, task_id, title, due_date, priority, category,
-                 status="Pending", course_id=None, description=""):
+                 status="Pending", course_id=None, description="", code=None, created_at=None, key=None,
+                 due_day=None):
         self.task_id = task_id
         self.title = title
         self.due_date = due_date
@@ -20,22 +73,46 @@ class Task:
         self.status = status
         self.course_id = course_id
         self.description = description
-        self.created_at = datetime.datetime.now().strftime("%Y-%m-%d")
+        self.code = code        # Course code from the courses join
+        self.key = key          # Extra sort / rank column of paged and search queries
+        self._created_at = created_at
+        self.due_day = due_day  # due_date as a day number (see epoch_day), set for rows read from the database
+
+    # Creation date stored in the database; only filled in (with today's
+    # date) on first access for tasks that were never saved. Saved rows
+    # without one (from before the column existed) return None.
+    @property
+    def created_at(self):
+        if self._created_at is None and self.task_id is None:
+            self._created_at = datetime.date.today().isoformat()
+        return self._created_at
+
+    # sqlite3 row factory for queries selecting TASK_COLUMNS (see database.py),
+    # optionally followed by one extra key column. Low-cardinality text
+    # (dates, priority, category, status, code) is shared between rows.
+    @classmethod
+    def from_row(cls, cursor, row):
+        return cls(row[0], row[1], _shared(row[2]), _shared(row[3]), _shared(row[4]),
+                   _shared(row[5]), row[6], "", _shared(row[7]), _shared(row[8]),
+                   row[10] if len(row) > 10 else None, row[9])
 
     # Calculate remaining days before deadline
-    def get_days_left(self):
+    # 'today' can be passed in when scoring many tasks at once
+    def get_days_left(self, today=None):
+        if self.due_day is not None: # No date parsing for tasks read from the database
+            return self.due_day - epoch_day(today or datetime.date.today())
         try:
             due = datetime.datetime.strptime(str(self.due_date), "%Y-%m-%d").date()
-            today = datetime.date.today()
+            today = today or datetime.date.today()
             return (due - today).days
         except Exception:
             # If date format is wrong, return 0
             return 0
 
     # Calculate smart priority score based on urgency and importance
-    def calculate_smart_score(self):
+    def calculate_smart_score(self, today=None):
         try:
-            days_left = self.get_days_left()
+            days_left = self.get_days_left(today)
 
             # Urgency calculation
             if days_left <= 0:
@@ -58,3 +135,119 @@ class Task:
             return int(score)
         except Exception:
             return 0
+
+
+# Recurring task: one stored rule (a task_series row) that repeats every
+# 'every_days' days from start_day, up to until_day when set (day numbers,
+# see epoch_day). Occurrences are generated when they are looked at and
+# only written to tasks once they are completed or edited.
+class Series:
+    __slots__ = ("series_id", "title", "priority", "category", "course_id", "code",
+                 "start_day", "every_days", "until_day")
+
+    def __init__(self, series_id, title, priority, category, course_id, code,
+                 start_day, every_days, until_day=None):
+        self.series_id = series_id
+        self.title = title
+        self.priority = priority
+        self.category = category
+        self.course_id = course_id
+        self.code = code
+        self.start_day = start_day
+        self.every_days = every_days
+        self.until_day = until_day
+
+    # Lazily yields the occurrences due from first_day to last_day (inclusive)
+    # as pending Task objects with an occurrence_id, earliest first.
+    # Days in 'taken' already have a tasks row and are skipped.
+    def occurrences(self, first_day, last_day, taken=()):
+        if self.until_day is not None: last_day = min(last_day, self.until_day)
+        skipped = max(0, -((self.start_day - first_day) // self.every_days)) # Periods before first_day
+        day = self.start_day + skipped * self.every_days
+        while day <= last_day:
+            if day not in taken:
+                yield Task(occurrence_id(self.series_id, day), self.title, day_date(day), self.priority,
+                           self.category, "Pending", self.course_id, "", self.code, due_day=day)
+            day += self.every_days
+
+
+# Convert a due date string (or a day number) to a day ordinal,
+# None if the format is wrong
+def parse_due_ordinal(due_date):
+    if type(due_date) is int: return due_date + EPOCH_ORDINAL
+    try:
+        return datetime.datetime.strptime(str(due_date), "%Y-%m-%d").date().toordinal()
+    except Exception:
+        return None
+
+# Batch version of Task.get_days_left / Task.calculate_smart_score.
+# Takes whole columns of due dates (strings or day numbers) and priorities
+# and returns (days_left, scores) with the same values the per-object
+# methods give.
+# Each distinct date string is parsed only once and 'today' is read once.
+# Returns NumPy arrays when NumPy is installed, plain lists otherwise.
+def batch_smart_scores(due_dates, priorities, today=None):
+    today_ord = (today or datetime.date.today()).toordinal()
+    parsed = {}
+    ordinals = []
+    for d in due_dates:
+        o = parsed.get(d, -1)
+        if o == -1:
+            o = parsed[d] = parse_due_ordinal(d)
+        ordinals.append(o)
+    importance = [PRIORITY_VALUES.get(p, 1) * 10 for p in priorities]
+
+    np = _numpy()
+    if np:
+        # Wrong date formats count as 0 days left, like get_days_left
+        days = np.array([today_ord if o is None else o for o in ordinals], dtype=np.int64) - today_ord
+        return days, array_scores(np, days, np.array(importance, dtype=np.int64))
+
+    days = [0 if o is None else o - today_ord for o in ordinals]
+    return days, [score_for(d, imp) for d, imp in zip(days, importance)]
+
+
+# Smart score from days left and importance (priority value * 10),
+# the formula of Task.calculate_smart_score
+def score_for(days_left, importance):
+    urgency = 100 + abs(days_left) * 10 if days_left <= 0 else max(0, 100 - (days_left * 10))
+    return int((urgency * 0.7) + (importance * 0.3))
+
+# score_for over NumPy arrays (np: the module from _numpy())
+def array_scores(np, days_left, importance):
+    urgency = np.where(days_left <= 0, 100 + np.abs(days_left) * 10, np.maximum(0, 100 - days_left * 10))
+    return (urgency * 0.7 + importance * 0.3).astype(np.int64)
+
+
+# Immutable dashboard state (counts, efficiency, nearest deadline, focus
+# task, suggestion, most urgent tasks by smart score). One snapshot is
+# shared by the main window and the widget until the database changes.
+DashboardSnapshot = collections.namedtuple("DashboardSnapshot", (
+    "token", "total", "done", "pending", "high_pending", "overdue", "due_today",
+    "efficiency", "nearest", "nearest_days", "focus", "suggestion", "urgent", "upcoming",
+    "categories",
+))
+
+
+# Build a DashboardSnapshot from DatabaseManager.get_summary() output
+# and the per-category rows of DatabaseManager.get_course_stats()
+def build_dashboard(summary, token=None, today=None, categories=()):
+    total, pending = summary["total"], summary["pending"]
+    efficiency = int(summary["done"] / total * 100) if total else 0
+    nearest = summary["nearest"]  # (title, due_date, due_day)
+    nearest_days = nearest[2] - epoch_day(today or datetime.date.today()) if nearest else None
+
+    if summary["urgent"]: focus = summary["urgent"][0]
+    elif nearest: focus = nearest[0]
+    else: focus = None
+
+    if not total: suggestion = "Start adding your work! 🚀"
+    elif not pending: suggestion = "Relax, All completed! 🎉"
+    elif efficiency < 50: suggestion = "⚠️ Low efficiency! Plan High Priority tasks."
+    else: suggestion = "Good pace! Keep it up."
+
+    return DashboardSnapshot(
+        token, total, summary["done"], pending, summary["high_pending"], summary["overdue"],
+        summary["due_today"], efficiency, nearest, nearest_days, focus, suggestion,
+        tuple(summary["urgent"]), tuple(summary["upcoming"]), tuple(categories),
+    )
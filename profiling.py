@@ -0,0 +1,287 @@
+# Opt-in profiler for the Academic Task Manager
+# Times DatabaseManager methods, the SQL statements they run and the Tk
+# callbacks, then writes a stats report when the program exits.
+#
+#   ATM_PROFILE=profile_report.txt python app.py
+#   python app.py --profile [profile_report.txt]
+#
+# Nothing is wrapped unless profiling is switched on, so a normal run
+# executes exactly the same code as before.
+import atexit
+import collections
+import datetime
+import functools
+import inspect
+import os
+import threading
+import time
+import types
+
+ENV_VAR = "ATM_PROFILE"
+DEFAULT_REPORT = "profile_report.txt"
+SLOW_MS = 20   # Statements at least this slow get their EXPLAIN QUERY PLAN captured
+WINDOW = 1000  # Latest samples kept per name for the percentiles
+
+# Statements EXPLAIN QUERY PLAN is run for (not PRAGMA, BEGIN, scripts, ...)
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+# Running totals for one name plus a rolling window of recent durations
+class Stat:
+    __slots__ = ("calls", "total", "max", "rows", "samples")
+
+    def __init__(self, window):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = collections.deque(maxlen=window)
+
+    def add(self, seconds, rows=None):
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if rows: self.rows += rows
+        self.samples.append(seconds)
+
+    # Adds time and rows to the latest call (fetches after a cursor execute)
+    def extend(self, seconds, rows=None):
+        self.total += seconds
+        if rows: self.rows += rows
+        if self.samples:
+            self.samples[-1] += seconds
+            self.max = max(self.max, self.samples[-1])
+
+    def percentile(self, q):
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+# Cursor stand-in that times every statement and counts the rows fetched.
+# Anything it does not override goes straight to the real cursor.
+class TimedCursor:
+    def __init__(self, cursor, profiler):
+        self._cursor = cursor
+        self._profiler = profiler
+        self._stat = None  # Stat of the statement that was executed last
+        self._sql = None
+        self._params = ()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"): object.__setattr__(self, name, value)
+        else: setattr(self._cursor, name, value)
+
+    def execute(self, sql, params=()):
+        start = time.perf_counter()
+        self._cursor.execute(sql, params)
+        elapsed = time.perf_counter() - start
+        self._sql, self._params = sql, params
+        rowcount = self._cursor.rowcount
+        self._stat = self._profiler.record("sql", statement_key(sql), elapsed, rowcount if rowcount > 0 else None)
+        self._check_slow()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        start = time.perf_counter()
+        self._cursor.executemany(sql, seq_of_params)
+        rowcount = self._cursor.rowcount
+        self._stat = self._profiler.record("sql", statement_key(sql), time.perf_counter() - start,
+                                           rowcount if rowcount > 0 else None)
+        self._sql = None # No single parameter set to explain
+        return self
+
+    def executescript(self, script):
+        start = time.perf_counter()
+        self._cursor.executescript(script)
+        self._stat = self._profiler.record("sql", statement_key(script), time.perf_counter() - start)
+        self._sql = None
+        return self
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+        result = fetch(*args)
+        if self._stat is not None:
+            rows = len(result) if isinstance(result, list) else int(result is not None)
+            with self._profiler.lock:
+                self._stat.extend(time.perf_counter() - start, rows)
+            self._check_slow()
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def fetchmany(self, size=None):
+        return self._fetch(self._cursor.fetchmany, size or self._cursor.arraysize)
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany(500)
+            if not rows: return
+            yield from rows
+
+    def _check_slow(self):
+        if self._sql is None or not self._stat.samples: return
+        seconds = self._stat.samples[-1]
+        if seconds * 1000 >= self._profiler.slow_ms:
+            self._profiler.explain(self._cursor.connection, self._sql, self._params, seconds)
+
+
+# A statement on one line, used as its key in stats and plans. The whole
+# text is kept: task queries share a long column list at the start.
+def statement_key(sql):
+    return " ".join(sql.split())
+
+
+# Short one-line name of a statement for the report: its start and its
+# end (where the tables, filters and order usually differ)
+def statement_name(sql, width=110):
+    text = statement_key(sql)
+    if len(text) <= width: return text
+    head = (width - 5) // 2
+    return text[:head] + " ... " + text[-(width - 5 - head):]
+
+
+class Profiler:
+    def __init__(self, path=DEFAULT_REPORT, slow_ms=SLOW_MS, window=WINDOW):
+        self.path = path
+        self.slow_ms = slow_ms
+        self.window = window
+        self.sections = {"call": {}, "sql": {}, "tk": {}, "late": {}}
+        self.plans = {}   # statement key -> (slowest seconds, full sql, plan lines)
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def record(self, section, name, seconds, rows=None):
+        with self.lock:
+            stat = self.sections[section].get(name)
+            if stat is None: stat = self.sections[section][name] = Stat(self.window)
+            stat.add(seconds, rows)
+        return stat
+
+    # Capture the query plan of a slow statement (kept for its slowest run)
+    def explain(self, conn, sql, params, seconds):
+        name = statement_key(sql)
+        known = self.plans.get(name)
+        if known and known[0] >= seconds: return
+        if not sql.lstrip().upper().startswith(EXPLAINABLE): return
+        try:
+            plan = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        except Exception as e:
+            plan = [f"(no plan: {e})"]
+        with self.lock:
+            self.plans[name] = (seconds, sql, plan)
+
+    # Timed replacement for fn, recorded under 'name' in the call section
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+            self.record("call", name, elapsed, len(result) if isinstance(result, list) else None)
+            return result
+        return timed
+
+    # Wrap the given methods of a class (default: every public plain method).
+    # Generators and context managers are left alone, timing them would only
+    # measure how long it takes to create them.
+    def instrument_class(self, cls, names=None):
+        for name, value in list(vars(cls).items()):
+            if names is not None and name not in names: continue
+            if names is None and name.startswith("_"): continue
+            if not isinstance(value, types.FunctionType): continue
+            if inspect.isgeneratorfunction(inspect.unwrap(value)): continue
+            setattr(cls, name, self.wrap(f"{cls.__name__}.{name}", value))
+
+    # Wrap a DatabaseManager class: its methods, and the cursors of every
+    # connection it opens from now on
+    def instrument_db(self, cls):
+        self.instrument_class(cls)
+        open_connection = cls.open_connection
+        @functools.wraps(open_connection)
+        def opened(db, *args, **kwargs):
+            return self.watch_cursors(open_connection(db, *args, **kwargs))
+        cls.open_connection = opened
+
+    # pooled: a database.PooledConnection
+    def watch_cursors(self, pooled):
+        pooled.cursor = TimedCursor(pooled.cursor, self)
+        pooled.task_cursor = TimedCursor(pooled.task_cursor, self)
+        return pooled
+
+    # Time every root.after callback and how late it ran compared with
+    # the delay it was scheduled with (the Tk event loop latency)
+    def watch_tk(self, root):
+        original = root.after
+        def after(ms, func=None, *args):
+            if func is None: return original(ms)
+            due = time.perf_counter() + ms / 1000
+            name = getattr(func, "__qualname__", repr(func))
+            @functools.wraps(func)
+            def run(*call_args):
+                start = time.perf_counter()
+                self.record("late", name, max(0.0, start - due))
+                try:
+                    return func(*call_args)
+                finally:
+                    self.record("tk", name, time.perf_counter() - start)
+            return original(ms, run, *args)
+        root.after = after
+
+    def report(self):
+        with self.lock:
+            sections = {k: dict(v) for k, v in self.sections.items()}
+            plans = dict(self.plans)
+        elapsed = time.perf_counter() - self.started
+        lines = [f"Academic Task Manager profile, written {datetime.datetime.now().isoformat(timespec='seconds')}"
+                 f" after {elapsed:.1f}s (percentiles over the last {self.window} samples)", ""]
+        titles = (("call", "Methods and handlers"), ("sql", "SQL statements (execute + fetch)"),
+                  ("tk", "Tk callbacks (run time)"), ("late", "Tk callbacks (delay past the scheduled time)"))
+        for section, title in titles:
+            stats = sections[section]
+            if not stats: continue
+            lines.append(f"== {title} ==")
+            lines.append(f"{'calls':>8} {'total ms':>10} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8} {'rows':>9}  name")
+            for name, s in sorted(stats.items(), key=lambda item: -item[1].total):
+                if section == "sql": name = statement_name(name)
+                lines.append(f"{s.calls:>8} {s.total * 1000:>10.1f} {s.total / s.calls * 1000:>8.2f} "
+                             f"{s.percentile(0.5) * 1000:>8.2f} {s.percentile(0.95) * 1000:>8.2f} "
+                             f"{s.max * 1000:>8.2f} {s.rows:>9}  {name}")
+            lines.append("")
+        if plans:
+            lines.append(f"== Slow statements (>= {self.slow_ms} ms) ==")
+            for name, (seconds, sql, plan) in sorted(plans.items(), key=lambda item: -item[1][0]):
+                lines.append(f"{seconds * 1000:.1f} ms  {statement_name(sql, 400)}")
+                lines.extend(f"    {step}" for step in plan)
+            lines.append("")
+        return "\n".join(lines)
+
+    def write(self, path=None):
+        with open(path or self.path, "w", encoding="utf-8") as f:
+            f.write(self.report())
+
+
+# Switch profiling on: instruments DatabaseManager and writes the report
+# to 'path' at exit. Returns the Profiler so callers can wrap more.
+def enable(path=DEFAULT_REPORT, slow_ms=SLOW_MS):
+    from database import DatabaseManager
+    profiler = Profiler(path, slow_ms)
+    profiler.instrument_db(DatabaseManager)
+    atexit.register(profiler.write)
+    return profiler
+
+
+# enable() if the ATM_PROFILE environment variable is set (to a report
+# path, or to 1 for the default file), otherwise None
+def from_env():
+    value = os.environ.get(ENV_VAR)
+    if not value or value == "0": return None
+    return enable(DEFAULT_REPORT if value == "1" else value)
@@ -0,0 +1,197 @@
+# Streaming bulk import / export of tasks and categories
+# Supports CSV and JSON Lines; everything is generator based so memory
+# stays flat no matter how many tasks are moved.
+import csv
+import json
+import time
+from datetime import datetime as dt_obj
+
+from database import DatabaseManager
+
+TASK_FIELDS = ("title", "due_date", "priority", "category", "status")
+COURSE_FIELDS = ("name", "code")
+PRIORITIES = ("High", "Medium", "Low")
+STATUSES = ("Pending", "Done")
+
+
+# Result of an import or export run, also passed to progress callbacks
+class TransferReport:
+    def __init__(self):
+        self.rows = 0
+        self.errors = []     # (line number, message) of skipped lines
+        self.last_line = 0   # Last input line that is safely committed
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def tick(self):
+        self.seconds = time.perf_counter() - self.started
+
+    # Throughput in rows per second
+    @property
+    def rate(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return (f"{self.rows} rows in {self.seconds:.2f}s ({self.rate:,.0f} rows/s), "
+                f"{len(self.errors)} skipped, last line {self.last_line}")
+
+
+# Guess the file format from its extension
+def detect_format(path):
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+# Yield (line number, record dict) from a CSV or JSON Lines file.
+# Lines that cannot be decoded are yielded as (line number, error message).
+def iter_records(fileobj, fmt):
+    if fmt == "csv":
+        reader = csv.DictReader(fileobj)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_no, line in enumerate(fileobj, start=1):
+            if not line.strip(): continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "expected a JSON object"
+                continue
+            yield line_no, record
+
+
+# Check one task record, returns (title, due, prio, category, status)
+# Raises ValueError with a readable message when the record is malformed
+def validate_task(record):
+    title = str(record.get("title") or "").strip()
+    due = str(record.get("due_date") or "").strip()
+    prio = str(record.get("priority") or "Medium").strip()
+    cat = str(record.get("category") or "").strip()
+    status = str(record.get("status") or "Pending").strip()
+    if not title: raise ValueError("title is required")
+    if not cat: raise ValueError("category is required")
+    due = dt_obj.strptime(due, "%Y-%m-%d").date().isoformat() # Same date rule as the GUI, stored as YYYY-MM-DD
+    if prio not in PRIORITIES: raise ValueError(f"unknown priority {prio!r}")
+    if status not in STATUSES: raise ValueError(f"unknown status {status!r}")
+    return title, due, prio, cat, status
+
+
+# Group an iterable into lists of at most 'size' items
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+
+# Import tasks from a CSV / JSON Lines file.
+# Rows are validated and inserted in chunks (one executemany and one commit
+# per chunk); categories are resolved to course_id through an in-memory map
+# and registered when missing. Malformed lines are recorded in the report
+# and skipped. To resume an interrupted run pass start_line=report.last_line.
+def import_tasks(db, path, fmt=None, chunk_size=5000, start_line=0, progress=None):
+    fmt = fmt or detect_format(path)
+    report = TransferReport()
+    course_ids = {code: cid for cid, _, code in db.get_courses()}
+
+    def valid_rows(records):
+        for line_no, record in records:
+            if line_no <= start_line: continue
+            if isinstance(record, str):
+                report.errors.append((line_no, record)); continue
+            try:
+                yield line_no, validate_task(record)
+            except ValueError as e:
+                report.errors.append((line_no, str(e)))
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for chunk in chunked(valid_rows(iter_records(f, fmt)), chunk_size):
+            missing = {row[3] for _, row in chunk if row[3] not in course_ids}
+            if missing: course_ids.update(db.ensure_courses(missing))
+            with db.transaction():
+                db.add_tasks([(t, d, p, c, course_ids[c], s) for _, (t, d, p, c, s) in chunk])
+            report.rows += len(chunk)
+            report.last_line = chunk[-1][0]
+            report.tick()
+            if progress: progress(report)
+    report.tick()
+    return report
+
+
+# Write records to a CSV or JSON Lines file, streaming from a row iterator
+def _write_rows(rows, path, fields, fmt, progress, chunk_size):
+    fmt = fmt or detect_format(path)
+    report = TransferReport()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            write = writer.writerow
+        else:
+            write = lambda row: f.write(json.dumps(dict(zip(fields, row))) + "\n")
+        for row in rows:
+            write(row)
+            report.rows += 1
+            report.last_line = report.rows
+            if progress and report.rows % chunk_size == 0:
+                report.tick(); progress(report)
+    report.tick()
+    return report
+
+
+# Export every task, streamed from the database with fetchmany
+def export_tasks(db, path, fmt=None, chunk_size=5000, progress=None):
+    return _write_rows(db.iter_task_rows(chunk_size), path, TASK_FIELDS, fmt, progress, chunk_size)
+
+
+# Export all categories (also created automatically by import_tasks)
+def export_courses(db, path, fmt=None):
+    rows = ((name, code) for _, name, code in db.get_courses())
+    return _write_rows(rows, path, COURSE_FIELDS, fmt, None, 5000)
+
+
+# Import categories from a file written by export_courses. A name in the
+# file replaces the name of a category that already exists.
+def import_courses(db, path, fmt=None):
+    fmt = fmt or detect_format(path)
+    report = TransferReport()
+    with open(path, newline="", encoding="utf-8") as f:
+        codes, names = [], {}
+        for line_no, record in iter_records(f, fmt):
+            code = "" if isinstance(record, str) else str(record.get("code") or "").strip()
+            if not code:
+                report.errors.append((line_no, record if isinstance(record, str) else "code is required"))
+                continue
+            codes.append(code)
+            name = str(record.get("name") or "").strip()
+            if name: names[code] = name
+            report.last_line = line_no
+    report.rows = len(db.ensure_courses(codes, names))
+    report.tick()
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Bulk import / export of tasks")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("path")
+    parser.add_argument("--db", default="academic_pro.db")
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--start-line", type=int, default=0, help="resume an import after this line")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db, tune=True)
+    show = lambda r: print(f"\r{r}", end="", flush=True)
+    if args.action == "import":
+        result = import_tasks(db, args.path, args.format, start_line=args.start_line, progress=show)
+    else:
+        result = export_tasks(db, args.path, args.format, progress=show)
+    print(f"\r{result}")
+    for line_no, message in result.errors[:20]:
+        print(f"  line {line_no}: {message}")
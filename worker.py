@@ -0,0 +1,144 @@
+# Background database worker
+# Runs every DatabaseManager call off the Tk thread so the mainloop never
+# waits on SQLite I/O: writes on one writer thread, reads on optional
+# reader threads that each have their own connection (DatabaseManager.
+# bind_reader) and run in parallel. Requests are queued and return
+# concurrent.futures.Future objects; callbacks are delivered back on the
+# Tk thread through root.after.
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class DatabaseWorker:
+    POLL_MS = 15 # How often finished results are collected while requests are in flight
+
+    def __init__(self, db, root=None, on_error=None, readers=0):
+        self.db = db
+        self.root = root
+        self.on_error = on_error   # Called on the Tk thread with the exception of a failed request
+        self.requests = queue.Queue()      # Writes, and reads while writes are pending
+        self.read_requests = queue.Queue() # Reads for the reader threads
+        self.pending_writes = 0    # Writes queued or running (under lock)
+        self.results = queue.Queue()
+        self.queued_reads = {}     # key -> Future of a read that has not started yet
+        self.lock = threading.Lock()
+        self.in_flight = 0         # Requests whose callback has not been delivered (Tk thread only)
+        self.poll_id = None
+        self.thread = threading.Thread(target=self.run, name="db-worker", daemon=True)
+        self.thread.start()
+        # An in-memory database has no reader connections (see bind_reader):
+        # reader threads would share the writer's connection without locking
+        if db.db_name == ":memory:": readers = 0
+        self.readers = [threading.Thread(target=self.run_reader, name=f"db-reader-{i}", daemon=True)
+                        for i in range(readers)]
+        for thread in self.readers: thread.start()
+
+    # Queue a write. Writes run one at a time in submission order.
+    # fn is called as fn(db, *args) on the worker thread; callback(result)
+    # or errback(exception) then runs on the Tk thread.
+    def write(self, fn, *args, callback=None, errback=None):
+        with self.lock:
+            # Reads queued before this write must not be reused by later reads
+            self.queued_reads.clear()
+            self.pending_writes += 1
+        return self.submit(fn, args, callback, errback, write=True)
+
+    # Queue a read. While a read with the same key is still waiting in the
+    # queue, new requests for that key share it instead of running again.
+    # The key must identify the query and its arguments.
+    # Reads go to the reader threads, except while writes are pending: then
+    # they queue behind the writes so they see their results.
+    def read(self, fn, *args, key=None, callback=None, errback=None):
+        with self.lock:
+            if key is not None:
+                future = self.queued_reads.get(key)
+                if future is not None:
+                    # Coalesced: the newest callbacks win, older ones are dropped
+                    future.callback, future.errback = callback, errback
+                    return future
+            parallel = bool(self.readers) and self.pending_writes == 0
+            future = self.submit(fn, args, callback, errback, parallel=parallel)
+            if key is not None:
+                self.queued_reads[key] = future
+                future.key = key
+            return future
+
+    def submit(self, fn, args, callback, errback=None, write=False, parallel=False):
+        future = Future()
+        future.callback = callback
+        future.errback = errback
+        future.key = None
+        if self.root is not None:
+            self.in_flight += 1
+            self.schedule_poll()
+        (self.read_requests if parallel else self.requests).put((future, fn, args, write))
+        return future
+
+    def run(self):
+        while True:
+            item = self.requests.get()
+            if item is None: break
+            self.execute(*item)
+
+    def run_reader(self):
+        self.db.bind_reader()
+        while True:
+            item = self.read_requests.get()
+            if item is None: break
+            self.execute(*item)
+
+    def execute(self, future, fn, args, write):
+        with self.lock:
+            if future.key is not None and self.queued_reads.get(future.key) is future:
+                del self.queued_reads[future.key]
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(self.db, *args))
+            except BaseException as e:
+                future.set_exception(e)
+        if write:
+            with self.lock: self.pending_writes -= 1
+        if self.root is not None: self.results.put(future)
+
+    def schedule_poll(self):
+        if self.poll_id is None:
+            self.poll_id = self.root.after(self.POLL_MS, self.poll)
+
+    # Runs on the Tk thread: hands finished results to their callbacks
+    def poll(self):
+        self.poll_id = None
+        try:
+            while True:
+                try:
+                    future = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                self.in_flight -= 1
+                if future.cancelled(): continue
+                error = future.exception()
+                if error is not None:
+                    self.call(future.errback, error)
+                    self.call(self.on_error, error)
+                else:
+                    self.call(future.callback, future.result())
+        finally:
+            # Results left behind by a failing on_error are picked up next time
+            if self.in_flight > 0: self.schedule_poll()
+
+    # Run a callback on the Tk thread. What it raises goes to on_error, so
+    # one broken callback does not stop the delivery of other results.
+    def call(self, fn, arg):
+        if fn is None: return
+        try:
+            fn(arg)
+        except Exception as e:
+            if self.on_error is None or fn is self.on_error: raise
+            self.on_error(e)
+
+    # Finish queued work (pending writes are not lost) and stop the thread
+    def stop(self, timeout=5):
+        self.requests.put(None)
+        for _ in self.readers: self.read_requests.put(None)
+        self.thread.join(timeout)
+        for thread in self.readers: thread.join(timeout)